@@ -0,0 +1,619 @@
+"""Drive every route through the full app and report latency and SQL per endpoint.
+
+Each size gets a seeded SQLite database (cached in --db-dir and copied before
+every run, since the write endpoints change it). One client per role logs in
+through POST /login, then each endpoint is requested --requests times in a
+row after --warmup unrecorded requests. Results are p50/p95/p99 latency,
+requests per second from a single client and SQL statements per request.
+
+--output saves the results as JSON. --baseline compares against a saved file
+and exits 1 if any endpoint got slower than --tolerance or issues more SQL.
+
+Usage: python benchmarks/http_endpoints.py [--sizes 1000,100000,1000000]
+       [--requests 200] [--warmup 5] [--only manager] [--db-dir DIR]
+       [--output results.json] [--baseline baseline.json] [--tolerance 0.2]
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter as Tally
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, select  # noqa: E402
+
+from app import create_app  # noqa: E402
+from models.leads import SERVICES, STATUSES  # noqa: E402
+from models.model import Employee, User, db, utcnow  # noqa: E402
+from models.seed import seed_database  # noqa: E402
+
+PASSWORD = "bench-pass1"
+# Search terms, all found in the seeded lead queries
+WORDS = "price weekend wedding offer call slot evening book".split()
+# p95 changes below this are timer noise, never a regression
+NOISE_MS = 1.0
+
+
+# Database layout for "leads" leads: an admin and a manager (employees 1 and
+# 2), spare managers to update and delete, a user per ten leads owning the
+# first leads (so they have a history), and leads spread over the last 180
+# days with their status events and service links
+def layout(leads):
+    return {
+        "leads": leads,
+        "users": max(100, leads // 10),
+        "employees": max(200, leads // 1000),
+    }
+
+
+def seed(path, leads):
+    sizes = layout(leads)
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}"})
+    with app.app_context():
+        db.create_all()
+        seed_database(
+            leads,
+            sizes["users"],
+            admins=1,
+            managers=sizes["employees"] - 1,
+            seed=leads,
+            password=PASSWORD,
+        )
+        db.engine.dispose()
+    return sizes
+
+
+# Function to add the seeded accounts the endpoints log in as to "sizes":
+# the first admin, manager and user, and a sample of user emails
+def accounts(app, sizes):
+    with app.app_context():
+        logins = {
+            option: db.session.execute(
+                select(Employee.email)
+                .where(Employee.option == option)
+                .order_by(Employee.id)
+                .limit(1)
+            ).scalar()
+            for option in ("admin", "manager")
+        }
+        logins["user"] = db.session.execute(
+            select(User.email).order_by(User.id).limit(1)
+        ).scalar()
+        user = db.session.execute(
+            select(User.lead_name, User.phone).order_by(User.id).limit(1)
+        ).one()
+        emails = db.session.scalars(select(User.email).limit(1000)).all()
+        db.session.remove()
+    return {**sizes, "logins": logins, "user": user, "user_emails": emails}
+
+
+def _lead_form(n, tag):
+    return {
+        "lead_name": f"Bench {tag} {n}",
+        "service": ["haircut", "massage"],
+        "phone_number": str(tag * 100000000 + n),
+        "query": "need an appointment",
+    }
+
+
+# Endpoint name -> (role, method, function building request kwargs from the
+# request number, the layout and a random generator). Writes use fresh phone
+# numbers per run and random ids, so some updates and deletes hit rows an
+# earlier request already deleted.
+ENDPOINTS = {
+    "GET /": ("anonymous", "GET", lambda n, s, r: {"path": "/"}),
+    "GET /signup": ("anonymous", "GET", lambda n, s, r: {"path": "/signup"}),
+    "POST /signup": (
+        "anonymous",
+        "POST",
+        lambda n, s, r: {
+            "path": "/signup",
+            "data": {
+                "lead_name": f"Signup {n}",
+                "email": f"signup{n}@gmail.com",
+                "phone_number": str(5100000000 + n),
+                "password": PASSWORD,
+            },
+        },
+    ),
+    "GET /login": ("anonymous", "GET", lambda n, s, r: {"path": "/login"}),
+    "POST /login": (
+        "anonymous",
+        "POST",
+        lambda n, s, r: {
+            "path": "/login",
+            "data": {
+                "email": r.choice(s["user_emails"]),
+                "password": PASSWORD,
+            },
+        },
+    ),
+    "GET /contact_us": ("anonymous", "GET", lambda n, s, r: {"path": "/contact_us"}),
+    "POST /contact_us": (
+        "anonymous",
+        "POST",
+        lambda n, s, r: {"path": "/contact_us", "data": _lead_form(n, 52)},
+    ),
+    "POST /login/forgot_password": (
+        "anonymous",
+        "POST",
+        lambda n, s, r: {
+            "path": "/login/forgot_password",
+            "data": {
+                "email": r.choice(s["user_emails"]),
+                "lead_name": s["user"].lead_name,
+                "phone_number": s["user"].phone,
+            },
+        },
+    ),
+    "GET /login/forgot_password": (
+        "anonymous",
+        "GET",
+        lambda n, s, r: {"path": "/login/forgot_password"},
+    ),
+    "GET /logout": ("anonymous", "GET", lambda n, s, r: {"path": "/logout"}),
+    "GET /login/user": ("user", "GET", lambda n, s, r: {"path": "/login/user"}),
+    "GET /your_details": ("user", "GET", lambda n, s, r: {"path": "/your_details"}),
+    "GET /your_details.json": (
+        "user",
+        "GET",
+        lambda n, s, r: {"path": "/your_details.json"},
+    ),
+    "GET /login/user/contact_us": (
+        "user",
+        "GET",
+        lambda n, s, r: {"path": "/login/user/contact_us"},
+    ),
+    "POST /login/user/contact_us": (
+        "user",
+        "POST",
+        lambda n, s, r: {
+            "path": "/login/user/contact_us",
+            "data": {"service": ["styling"], "query": f"follow up {n}"},
+        },
+    ),
+    "GET /login/user/reset_pwd": (
+        "user",
+        "GET",
+        lambda n, s, r: {"path": "/login/user/reset_pwd"},
+    ),
+    "POST /login/user/reset_pwd": (
+        "user",
+        "POST",
+        lambda n, s, r: {
+            "path": "/login/user/reset_pwd",
+            "data": {"password": PASSWORD, "confirm_password": PASSWORD},
+        },
+    ),
+    "GET /login/admin": ("admin", "GET", lambda n, s, r: {"path": "/login/admin"}),
+    "GET /login/admin/employee": (
+        "admin",
+        "GET",
+        lambda n, s, r: {"path": "/login/admin/employee"},
+    ),
+    "GET /login/admin/users": (
+        "admin",
+        "GET",
+        lambda n, s, r: {"path": "/login/admin/users"},
+    ),
+    "GET /admin/all_employees": (
+        "admin",
+        "GET",
+        lambda n, s, r: {"path": "/admin/all_employees"},
+    ),
+    "GET /admin/add": ("admin", "GET", lambda n, s, r: {"path": "/admin/add"}),
+    "POST /admin/add": (
+        "admin",
+        "POST",
+        lambda n, s, r: {
+            "path": "/admin/add",
+            "data": {
+                "lead_name": f"Added {n}",
+                "email": f"added{n}@gmail.com",
+                "phone_number": str(5300000000 + n),
+                "password": PASSWORD,
+                "option": "user",
+            },
+        },
+    ),
+    "GET /admin/update": (
+        "admin",
+        "GET",
+        lambda n, s, r: {"path": f"/admin/update?id={r.randint(1, s['employees'])}"},
+    ),
+    "POST /admin/update": (
+        "admin",
+        "POST",
+        lambda n, s, r: {
+            "path": "/admin/update",
+            "data": {
+                "id": r.randint(3, s["employees"]),
+                "lead_name": f"Staff {n}",
+                "email": f"renamed{n}@manager.com",
+                "phone_number": str(5400000000 + n),
+                "option": "manager",
+            },
+        },
+    ),
+    "GET /admin/update/user": (
+        "admin",
+        "GET",
+        lambda n, s, r: {"path": "/admin/update/user"},
+    ),
+    "POST /admin/update/user": (
+        "admin",
+        "POST",
+        lambda n, s, r: {
+            "path": "/admin/update/user",
+            "data": {
+                "id": r.randint(2, s["users"]),
+                "lead_name": f"User {n}",
+                "email": f"renamed{n}@gmail.com",
+                "phone_number": str(5500000000 + n),
+            },
+        },
+    ),
+    "GET /admin/delete": (
+        "admin",
+        "GET",
+        lambda n, s, r: {"path": f"/admin/delete?id={r.randint(3, s['employees'])}"},
+    ),
+    "GET /admin/delete/user": (
+        "admin",
+        "GET",
+        lambda n, s, r: {"path": f"/admin/delete/user?id={r.randint(2, s['users'])}"},
+    ),
+    "GET /login/manager": (
+        "manager",
+        "GET",
+        lambda n, s, r: {"path": "/login/manager"},
+    ),
+    "GET /manager/all_leads": (
+        "manager",
+        "GET",
+        lambda n, s, r: {"path": "/manager/all_leads"},
+    ),
+    "GET /manager/all_leads/add": (
+        "manager",
+        "GET",
+        lambda n, s, r: {"path": "/manager/all_leads/add"},
+    ),
+    "POST /manager/all_leads/add": (
+        "manager",
+        "POST",
+        lambda n, s, r: {"path": "/manager/all_leads/add", "data": _lead_form(n, 56)},
+    ),
+    "POST /manager/all_leads/import": (
+        "manager",
+        "POST",
+        lambda n, s, r: {
+            "path": "/manager/all_leads/import",
+            "data": {"file": (_import_file(n), "leads.csv")},
+        },
+    ),
+    "GET /manager/all_leads/update": (
+        "manager",
+        "GET",
+        lambda n, s, r: {"path": "/manager/all_leads/update"},
+    ),
+    "POST /manager/all_leads/update": (
+        "manager",
+        "POST",
+        lambda n, s, r: {
+            "path": "/manager/all_leads/update",
+            "data": {"id": r.randint(1, s["leads"]), "status": r.choice(STATUSES)},
+        },
+    ),
+    "GET /manager/all_leads/delete": (
+        "manager",
+        "GET",
+        lambda n, s, r: {
+            "path": f"/manager/all_leads/delete?id={r.randint(1, s['leads'])}"
+        },
+    ),
+    "POST /manager/all_leads/bulk_status": (
+        "manager",
+        "POST",
+        lambda n, s, r: {
+            "path": "/manager/all_leads/bulk_status",
+            "json": {
+                "ids": r.sample(range(1, s["leads"] + 1), 100),
+                "status": r.choice(STATUSES),
+            },
+        },
+    ),
+    "POST /manager/all_leads/bulk_delete": (
+        "manager",
+        "POST",
+        lambda n, s, r: {
+            "path": "/manager/all_leads/bulk_delete",
+            "json": {"ids": r.sample(range(1, s["leads"] + 1), 10)},
+        },
+    ),
+    "GET /login/manager/all_queries": (
+        "manager",
+        "GET",
+        lambda n, s, r: {
+            "path": "/login/manager/all_queries",
+            "query_string": r.choice(
+                [
+                    {},
+                    {"status": r.choice(STATUSES)},
+                    {"service": r.choice(SERVICES)},
+                    {"sort": "lead_name", "order": "desc"},
+                    {"q": r.choice(WORDS)},
+                ]
+            ),
+        },
+    ),
+    "POST /login/manager/all_queries": (
+        "manager",
+        "POST",
+        lambda n, s, r: _grid_update(r.randint(s["users"] + 1, s["leads"]), n, r),
+    ),
+    "GET /login/manager/all_queries.json": (
+        "manager",
+        "GET",
+        lambda n, s, r: {
+            "path": "/login/manager/all_queries.json",
+            "query_string": {"status": r.choice(STATUSES)},
+        },
+    ),
+    "GET /login/manager/all_queries/export": (
+        "manager",
+        "GET",
+        lambda n, s, r: {
+            "path": "/login/manager/all_queries/export",
+            "query_string": {"format": "ndjson", "status": "converted"},
+        },
+    ),
+    "GET /login/manager/funnel": (
+        "manager",
+        "GET",
+        lambda n, s, r: {"path": "/login/manager/funnel"},
+    ),
+    "GET /login/manager/funnel.json": (
+        "manager",
+        "GET",
+        lambda n, s, r: {"path": "/login/manager/funnel.json"},
+    ),
+    "GET /login/manager/reports": (
+        "manager",
+        "GET",
+        lambda n, s, r: {
+            "path": "/login/manager/reports",
+            "query_string": {"period": r.choice(["week", "month"])},
+        },
+    ),
+    "GET /login/manager/reports.json": (
+        "manager",
+        "GET",
+        lambda n, s, r: {
+            "path": "/login/manager/reports.json",
+            "query_string": {"period": r.choice(["week", "month"])},
+        },
+    ),
+}
+
+# Endpoints too slow to repeat --requests times: full exports, and password
+# hashing or verification on every request
+MAX_REQUESTS = {
+    "GET /login/manager/all_queries/export": 5,
+    "POST /signup": 20,
+    "POST /login": 20,
+    "POST /login/user/reset_pwd": 20,
+    "POST /admin/add": 20,
+}
+
+
+def _import_file(n):
+    lines = ["lead_name,service,phone_number,query,status"]
+    lines += [
+        f"Import {n} {i},haircut,{5700000000 + n * 20 + i},need an appointment,pending"
+        for i in range(20)
+    ]
+    return io.BytesIO("\n".join(lines).encode())
+
+
+def _grid_update(lead_id, n, rng):
+    return {
+        "path": "/login/manager/all_queries",
+        "data": {
+            "id": lead_id,
+            "lead_name": f"Lead {lead_id}",
+            "service": ["waxing"],
+            "phone_number": str(5800000000 + n),
+            "query": "need an appointment",
+            "status": rng.choice(STATUSES),
+        },
+    }
+
+
+
+def clients(app, logins):
+    logged_in = {"anonymous": app.test_client()}
+    for role, email in logins.items():
+        client = app.test_client()
+        response = client.post("/login", data={"email": email, "password": PASSWORD})
+        assert response.status_code == 302, f"{role} login failed"
+        logged_in[role] = client
+    return logged_in
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(app, sizes, names, requests, warmup):
+    statements = [0]
+
+    def count(*args):
+        statements[0] += 1
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", count)
+    rng = random.Random(0)
+    results = {}
+    try:
+        by_role = clients(app, sizes["logins"])
+        for name in names:
+            role, method, build = ENDPOINTS[name]
+            client = by_role[role]
+            total = min(requests, MAX_REQUESTS.get(name, requests))
+            latencies, counts, codes = [], [], Tally()
+            for n in range(warmup):
+                client.open(method=method, **build(n, sizes, rng)).get_data()
+            started = time.perf_counter()
+            for n in range(warmup, warmup + total):
+                kwargs = build(n, sizes, rng)
+                statements[0] = 0
+                begun = time.perf_counter()
+                response = client.open(method=method, **kwargs)
+                response.get_data()
+                latencies.append((time.perf_counter() - begun) * 1000)
+                counts.append(statements[0])
+                codes[response.status_code] += 1
+            wall = time.perf_counter() - started
+            if role == "anonymous":
+                with client.session_transaction() as session:
+                    session.clear()
+            latencies.sort()
+            results[name] = {
+                "requests": total,
+                "p50_ms": round(percentile(latencies, 0.50), 3),
+                "p95_ms": round(percentile(latencies, 0.95), 3),
+                "p99_ms": round(percentile(latencies, 0.99), 3),
+                "rps": round(total / wall, 1) if wall else None,
+                "statements": statistics.median(counts),
+                "statements_max": max(counts),
+                "status": {str(code): hits for code, hits in sorted(codes.items())},
+            }
+            print(
+                f"  {name:42} p50 {results[name]['p50_ms']:8.2f}ms  "
+                f"p95 {results[name]['p95_ms']:8.2f}ms  "
+                f"p99 {results[name]['p99_ms']:8.2f}ms  "
+                f"{results[name]['rps']:8.1f}/s  "
+                f"sql {results[name]['statements']:g}  "
+                f"{results[name]['status']}"
+            )
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+    return results
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for size, endpoints in results["sizes"].items():
+        for name, now in endpoints.items():
+            before = baseline.get("sizes", {}).get(size, {}).get(name)
+            if before is None:
+                continue
+            slower = now["p95_ms"] > before["p95_ms"] * (1 + tolerance) and (
+                now["p95_ms"] - before["p95_ms"] > NOISE_MS
+            )
+            chattier = now["statements"] > before["statements"]
+            if slower or chattier:
+                regressions.append(
+                    f"{size:>8} {name:42} p95 {before['p95_ms']:.2f} -> "
+                    f"{now['p95_ms']:.2f}ms, sql {before['statements']:g} -> "
+                    f"{now['statements']:g}"
+                )
+    return regressions
+
+
+def run(sizes, requests, warmup, only, db_dir, output, baseline, tolerance, reseed):
+    names = [name for name in ENDPOINTS if not only or ENDPOINTS[name][0] in only]
+    os.makedirs(db_dir, exist_ok=True)
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests": requests,
+            "warmup": warmup,
+            "created": utcnow().isoformat(timespec="seconds"),
+        },
+        "sizes": {},
+    }
+    for leads in sizes:
+        seeded = os.path.join(db_dir, f"leads-{leads}.db")
+        if reseed or not os.path.exists(seeded):
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(seeded + suffix):
+                    os.remove(seeded + suffix)
+            started = time.perf_counter()
+            seed(seeded, leads)
+            print(f"seeded {leads} leads in {time.perf_counter() - started:.1f}s")
+        working = os.path.join(db_dir, f"run-{leads}.db")
+        shutil.copyfile(seeded, working)
+        app = create_app(
+            {"SQLALCHEMY_DATABASE_URI": f"sqlite:///{working}", "TEMPLATE_WARMUP": True}
+        )
+        # Failing endpoints show up as 500s in the status counts instead
+        app.logger.setLevel(logging.CRITICAL)
+        print(f"{leads} leads")
+        results["sizes"][str(leads)] = measure(
+            app, accounts(app, layout(leads)), names, requests, warmup
+        )
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(working + suffix):
+                os.remove(working + suffix)
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"results written to {output}")
+    if baseline:
+        with open(baseline) as f:
+            regressions = compare(results, json.load(f), tolerance)
+        if regressions:
+            print(f"{len(regressions)} regressions against {baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            raise SystemExit(1)
+        print(f"no regressions against {baseline}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,100000,1000000")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument(
+        "--only",
+        action="append",
+        choices=["anonymous", "user", "admin", "manager"],
+        help="Limit to one role's endpoints; repeatable.",
+    )
+    parser.add_argument(
+        "--db-dir", default=os.path.join(tempfile.gettempdir(), "leads-bench")
+    )
+    parser.add_argument("--reseed", action="store_true")
+    parser.add_argument("--output")
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+    run(
+        [int(size) for size in args.sizes.split(",")],
+        args.requests,
+        args.warmup,
+        args.only,
+        args.db_dir,
+        args.output,
+        args.baseline,
+        args.tolerance,
+        args.reseed,
+    )
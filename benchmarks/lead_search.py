@@ -0,0 +1,108 @@
+"""Time ranked lead search (FTS5) against a LIKE scan over a large lead table.
+
+Usage: python benchmarks/lead_search.py [--rows 1000000] [--runs 20]
+"""
+import argparse
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, or_  # noqa: E402
+
+from app import create_app  # noqa: E402
+from models.leads import grid_filters, lead_grid  # noqa: E402
+from models.model import Query, db  # noqa: E402
+
+# Zipf-distributed vocabulary of made-up words, so searches range from very
+# common to rare words
+_rng = random.Random(7)
+VOCABULARY = sorted(
+    {
+        "".join(_rng.choices("abcdefghijklmnopqrstuvwxyz", k=_rng.randint(4, 9)))
+        for _ in range(20000)
+    }
+)
+_rng.shuffle(VOCABULARY)
+CUM_WEIGHTS = list(itertools.accumulate(1 / (i + 1) for i in range(len(VOCABULARY))))
+SERVICES = ["haircut", "massage", "waxing", "conditioning", "styling", "tanning"]
+SEARCHES = {
+    "most common": VOCABULARY[0],
+    "common": VOCABULARY[50],
+    "rare": VOCABULARY[5000],
+    "two words": f"{VOCABULARY[50]} {VOCABULARY[7]}",
+    "typed prefix": VOCABULARY[3][:3],
+}
+
+
+def seed(rows):
+    rng = random.Random(42)
+    batch = []
+    for i in range(rows):
+        batch.append(
+            {
+                "lead_name": f"lead{i}",
+                "service": rng.choice(SERVICES),
+                "phone_number": str(7000000000 + i),
+                "query": " ".join(rng.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=8)),
+                "status": "pending",
+            }
+        )
+        if len(batch) == 10000:
+            db.session.execute(insert(Query.__table__), batch)
+            batch = []
+    if batch:
+        db.session.execute(insert(Query.__table__), batch)
+    db.session.commit()
+
+
+# What managers had before: unranked substring matching
+def like_search(text):
+    query = db.session.query(Query)
+    for word in text.split():
+        pattern = f"%{word}%"
+        query = query.filter(
+            or_(Query.lead_name.like(pattern), Query.query.like(pattern))
+        )
+    return query.order_by(Query.id.desc()).limit(25).all()
+
+
+def timed(fn, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def run(rows, runs):
+    path = os.path.join(tempfile.mkdtemp(), "search.db")
+    app = create_app(
+        {"SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}", "TEMPLATE_WARMUP": False}
+    )
+    with app.app_context():
+        db.create_all()
+        started = time.perf_counter()
+        seed(rows)
+        print(f"seeded {rows} leads in {time.perf_counter() - started:.1f}s")
+
+        print(f"{'search':15} {'fts ms':>8} {'like ms':>8}")
+        for name, text in SEARCHES.items():
+            filters = grid_filters({"q": text})
+            fts_ms = timed(lambda: lead_grid(filters).items, runs)
+            like_ms = timed(lambda: like_search(text), max(1, runs // 5))
+            print(f"{name:15} {fts_ms:8.1f} {like_ms:8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    run(args.rows, args.runs)
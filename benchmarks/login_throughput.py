@@ -0,0 +1,50 @@
+"""Measure password verifications (the CPU cost of a login) per second per core.
+
+Usage: python benchmarks/login_throughput.py [--method scrypt:32768:8:1]
+       [--logins 200] [--clients 16]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask  # noqa: E402
+
+from models import passwords  # noqa: E402
+
+
+def run(method, logins, clients):
+    app = Flask(__name__)
+    app.config["PASSWORD_HASH_METHOD"] = method
+
+    with app.app_context():
+        stored = passwords.hash_password("correct-horse")
+
+    def login(_):
+        with app.app_context():
+            return passwords.verify_password(stored, "correct-horse")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as request_threads:
+        assert all(request_threads.map(login, range(logins)))
+    elapsed = time.perf_counter() - started
+
+    cores = os.cpu_count() or 1
+    per_second = logins / elapsed
+    print(f"method:           {method}")
+    print(f"logins:           {logins} from {clients} concurrent clients")
+    print(f"elapsed:          {elapsed:.2f}s")
+    print(f"logins/s:         {per_second:.1f}")
+    print(f"logins/s/core:    {per_second / cores:.1f} ({cores} cores)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--method", default=passwords.DEFAULT_METHOD)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=16)
+    args = parser.parse_args()
+    run(args.method, args.logins, args.clients)
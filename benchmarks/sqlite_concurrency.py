@@ -0,0 +1,120 @@
+"""Compare multi-process read/write throughput with and without the SQLite profile.
+
+Usage: python benchmarks/sqlite_concurrency.py [--readers 4] [--writers 2]
+       [--seconds 5] [--rows 20000]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event, func, insert, select  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from models.engine import SQLITE_PRAGMAS, set_pragmas  # noqa: E402
+from models.model import Query, db  # noqa: E402
+
+PROFILES = {"default": {}, "tuned": SQLITE_PRAGMAS}
+table = Query.__table__
+
+
+def make_engine(path, pragmas):
+    engine = create_engine(f"sqlite:///{path}")
+    if pragmas:
+        event.listen(engine, "connect", lambda conn, _: set_pragmas(conn, pragmas))
+    return engine
+
+
+def seed(path, pragmas, rows):
+    engine = make_engine(path, pragmas)
+    db.metadata.create_all(engine, tables=[table])
+    with engine.begin() as conn:
+        conn.execute(
+            insert(table),
+            [
+                {
+                    "lead_name": f"lead{i}",
+                    "service": "haircut",
+                    "phone_number": str(7000000000 + i),
+                    "query": "benchmark lead",
+                    "status": "pending",
+                }
+                for i in range(rows)
+            ],
+        )
+    engine.dispose()
+
+
+def worker(role, path, pragmas, seconds, seq, results):
+    engine = make_engine(path, pragmas)
+    ops = errors = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        try:
+            if role == "write":
+                with engine.begin() as conn:
+                    conn.execute(
+                        insert(table).values(
+                            lead_name="bench",
+                            service="massage",
+                            phone_number=str(8000000000 + seq * 1000000 + ops),
+                            query="benchmark write",
+                            status="pending",
+                        )
+                    )
+            else:
+                with engine.connect() as conn:
+                    conn.execute(
+                        select(func.count())
+                        .select_from(table)
+                        .where(table.c.status == "pending")
+                    ).scalar()
+            ops += 1
+        except OperationalError:
+            errors += 1
+    engine.dispose()
+    results.put((role, ops, errors))
+
+
+def run(name, pragmas, readers, writers, seconds, rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, f"{name}.db")
+        seed(path, pragmas, rows)
+        results = multiprocessing.Queue()
+        roles = ["read"] * readers + ["write"] * writers
+        procs = [
+            multiprocessing.Process(
+                target=worker, args=(role, path, pragmas, seconds, seq, results)
+            )
+            for seq, role in enumerate(roles)
+        ]
+        for proc in procs:
+            proc.start()
+        totals = {"read": [0, 0], "write": [0, 0]}
+        for _ in procs:
+            role, ops, errors = results.get()
+            totals[role][0] += ops
+            totals[role][1] += errors
+        for proc in procs:
+            proc.join()
+
+    for role, (ops, errors) in totals.items():
+        print(
+            f"{name:8} {role:6} {ops / seconds:10.1f} ops/s   "
+            f"{errors} 'database is locked' errors"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+    for name, pragmas in PROFILES.items():
+        run(name, pragmas, args.readers, args.writers, args.seconds, args.rows)
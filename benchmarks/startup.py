@@ -0,0 +1,56 @@
+"""Measure cold-start cost: importing the app, create_app() and the first request.
+
+Each run happens in a fresh interpreter so nothing is cached in sys.modules.
+
+Usage: python benchmarks/startup.py [--runs 10]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+app = create_app({"SQLALCHEMY_DATABASE_URI": "sqlite://"})
+created = time.perf_counter()
+app.test_client().get("/")
+served = time.perf_counter()
+print(json.dumps({
+    "import": imported - started,
+    "create_app": created - imported,
+    "first_request": served - created,
+    "modules": len(sys.modules),
+}))
+"""
+
+
+def run(runs):
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE],
+            cwd=ROOT,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        samples.append(json.loads(output.splitlines()[-1]))
+
+    print(f"{'phase':15} {'median ms':>10} {'max ms':>10}")
+    for phase in ("import", "create_app", "first_request"):
+        values = [sample[phase] * 1000 for sample in samples]
+        print(f"{phase:15} {statistics.median(values):10.1f} {max(values):10.1f}")
+    print(f"modules loaded: {samples[-1]['modules']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    run(parser.parse_args().runs)
@@ -0,0 +1,43 @@
+"""dashboard counters
+
+Revision ID: 3f1c2a9d7b10
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d7b10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'dashboard_counters',
+        sa.Column('scope', sa.String(), nullable=False),
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('value', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('scope', 'key'),
+    )
+    op.execute(
+        "INSERT INTO dashboard_counters (scope, key, value) "
+        "SELECT 'user_queries', COALESCE(status, ''), COUNT(*) "
+        "FROM user_queries GROUP BY COALESCE(status, '')"
+    )
+    op.execute(
+        "INSERT INTO dashboard_counters (scope, key, value) "
+        "SELECT 'users', option, COUNT(*) FROM users GROUP BY option"
+    )
+    op.execute(
+        "INSERT INTO dashboard_counters (scope, key, value) "
+        "SELECT 'employees', option, COUNT(*) FROM employees GROUP BY option"
+    )
+
+
+def downgrade():
+    op.drop_table('dashboard_counters')
@@ -0,0 +1,88 @@
+"""canonical phone
+
+Revision ID: 5b9e3d4c2f17
+Revises: c7d2e5f81a46
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b9e3d4c2f17'
+down_revision = 'c7d2e5f81a46'
+branch_labels = None
+depends_on = None
+
+TABLES = ['users', 'employees', 'user_queries']
+
+
+# Frozen copy of models.phones.canonical_phone
+def canonical_phone(value):
+    if value is None:
+        return None
+    digits = re.sub(r'\D', '', str(value))
+    if len(digits) == 12 and digits.startswith('91'):
+        digits = digits[2:]
+    elif len(digits) == 11 and digits.startswith('0'):
+        digits = digits[1:]
+    return digits if len(digits) == 10 else None
+
+
+def upgrade():
+    # Plain ADD COLUMN, so SQLite doesn't rebuild user_queries and drop its
+    # search triggers
+    for table in TABLES:
+        op.add_column(table, sa.Column('phone', sa.String(length=10), nullable=True))
+
+    # Backfill in Python, the same normalization the models apply on write.
+    # Numbers that don't normalize are left NULL and reported.
+    connection = op.get_bind()
+    for name in TABLES:
+        table = sa.table(
+            name, sa.column('id'), sa.column('phone_number'), sa.column('phone')
+        )
+        rows = connection.execute(sa.select(table.c.id, table.c.phone_number)).all()
+        updates = [
+            {'row_id': row_id, 'phone': canonical_phone(phone_number)}
+            for row_id, phone_number in rows
+        ]
+        invalid = sum(1 for update in updates if update['phone'] is None)
+        if invalid:
+            print(f'{name}: {invalid} phone numbers could not be normalized')
+        updates = [update for update in updates if update['phone'] is not None]
+        if updates:
+            connection.execute(
+                table.update()
+                .where(table.c.id == sa.bindparam('row_id'))
+                .values(phone=sa.bindparam('phone')),
+                updates,
+            )
+
+    op.create_index('ix_users_phone', 'users', ['phone'], unique=True)
+    op.create_index('ix_employees_phone', 'employees', ['phone'], unique=True)
+    op.create_index(
+        'ix_user_queries_phone_lead_name',
+        'user_queries',
+        ['phone', 'lead_name'],
+        unique=False,
+    )
+    op.drop_index('ix_user_queries_phone_number_lead_name', table_name='user_queries')
+
+
+def downgrade():
+    op.create_index(
+        'ix_user_queries_phone_number_lead_name',
+        'user_queries',
+        ['phone_number', 'lead_name'],
+        unique=False,
+    )
+    op.drop_index('ix_user_queries_phone_lead_name', table_name='user_queries')
+    op.drop_index('ix_employees_phone', table_name='employees')
+    op.drop_index('ix_users_phone', table_name='users')
+    # Plain DROP COLUMN (SQLite 3.35+) keeps the user_queries search triggers
+    for table in TABLES:
+        op.drop_column(table, 'phone')
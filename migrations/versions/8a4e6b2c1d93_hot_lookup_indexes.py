@@ -0,0 +1,42 @@
+"""hot lookup indexes
+
+Revision ID: 8a4e6b2c1d93
+Revises: 3f1c2a9d7b10
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a4e6b2c1d93'
+down_revision = '3f1c2a9d7b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user_queries', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_user_queries_phone_number_lead_name',
+            ['phone_number', 'lead_name'],
+            unique=False,
+        )
+        batch_op.create_index(
+            batch_op.f('ix_user_queries_status'), ['status'], unique=False
+        )
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f('ix_users_lead_name'), ['lead_name'], unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_lead_name'))
+
+    with op.batch_alter_table('user_queries', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_user_queries_status'))
+        batch_op.drop_index('ix_user_queries_phone_number_lead_name')
@@ -0,0 +1,58 @@
+"""lead status events
+
+Revision ID: 9d4a7c1e6b52
+Revises: 5b9e3d4c2f17
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4a7c1e6b52'
+down_revision = '5b9e3d4c2f17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'lead_status_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('lead_id', sa.Integer(), nullable=False),
+        sa.Column('from_status', sa.String(), nullable=True),
+        sa.Column('to_status', sa.String(), nullable=False),
+        sa.Column('at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_lead_status_events_lead_id_to_status',
+        'lead_status_events',
+        ['lead_id', 'to_status'],
+        unique=False,
+    )
+
+    # Existing leads start the log in their current status. When they got
+    # there is unknown, so "at" stays NULL and their first move isn't timed.
+    op.execute(
+        "INSERT INTO lead_status_events (lead_id, from_status, to_status, at) "
+        "SELECT id, NULL, COALESCE(status, ''), NULL FROM user_queries ORDER BY id"
+    )
+    for scope in ('funnel_reached', 'funnel_entered'):
+        op.execute(
+            "INSERT INTO dashboard_counters (scope, key, value) "
+            f"SELECT '{scope}', to_status, COUNT(*) "
+            "FROM lead_status_events GROUP BY to_status"
+        )
+
+
+def downgrade():
+    op.execute(
+        "DELETE FROM dashboard_counters WHERE scope IN ('funnel_reached', "
+        "'funnel_entered', 'funnel_moves', 'stage_exits', 'stage_seconds')"
+    )
+    op.drop_index(
+        'ix_lead_status_events_lead_id_to_status', table_name='lead_status_events'
+    )
+    op.drop_table('lead_status_events')
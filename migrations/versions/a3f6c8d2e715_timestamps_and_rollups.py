@@ -0,0 +1,46 @@
+"""timestamps and rollups
+
+Revision ID: a3f6c8d2e715
+Revises: e2b8f5a3c940
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f6c8d2e715'
+down_revision = 'e2b8f5a3c940'
+branch_labels = None
+depends_on = None
+
+TABLES = ['users', 'employees', 'user_queries']
+
+
+def upgrade():
+    # Plain ADD COLUMN, so SQLite doesn't rebuild user_queries and drop its
+    # search triggers. Existing rows keep NULL: when they were made is unknown.
+    for table in TABLES:
+        op.add_column(table, sa.Column('created_at', sa.DateTime(), nullable=True))
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(), nullable=True))
+        op.create_index(f'ix_{table}_created_at', table, ['created_at'], unique=False)
+
+    op.create_table(
+        'daily_rollups',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('dimension', sa.String(), nullable=False),
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'dimension', 'key'),
+    )
+
+
+def downgrade():
+    op.execute("DELETE FROM dashboard_counters WHERE scope = 'rollup_marks'")
+    op.drop_table('daily_rollups')
+    # Plain DROP COLUMN (SQLite 3.35+) keeps the user_queries search triggers
+    for table in TABLES:
+        op.drop_index(f'ix_{table}_created_at', table_name=table)
+        op.drop_column(table, 'updated_at')
+        op.drop_column(table, 'created_at')
@@ -0,0 +1,29 @@
+"""service counters
+
+Revision ID: b6d1e9f4a283
+Revises: a3f6c8d2e715
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6d1e9f4a283'
+down_revision = 'a3f6c8d2e715'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Leads per service move to the dashboard counters, counted once here
+    op.execute(
+        "INSERT INTO dashboard_counters (scope, key, value) "
+        "SELECT 'services', services.name, COUNT(*) FROM lead_services "
+        "JOIN services ON services.id = lead_services.service_id "
+        "GROUP BY services.name"
+    )
+
+
+def downgrade():
+    op.execute("DELETE FROM dashboard_counters WHERE scope = 'services'")
@@ -0,0 +1,66 @@
+"""lead search index
+
+Revision ID: c7d2e5f81a46
+Revises: 8a4e6b2c1d93
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7d2e5f81a46'
+down_revision = '8a4e6b2c1d93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FTS5 is SQLite only; other databases fall back to LIKE in models.search
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute(
+        """CREATE VIRTUAL TABLE IF NOT EXISTS user_queries_fts USING fts5(
+            lead_name, query,
+            content='user_queries', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )"""
+    )
+    op.execute(
+        """CREATE TRIGGER IF NOT EXISTS user_queries_fts_insert
+        AFTER INSERT ON user_queries BEGIN
+            INSERT INTO user_queries_fts(rowid, lead_name, query)
+            VALUES (new.id, new.lead_name, new.query);
+        END"""
+    )
+    op.execute(
+        """CREATE TRIGGER IF NOT EXISTS user_queries_fts_delete
+        AFTER DELETE ON user_queries BEGIN
+            INSERT INTO user_queries_fts(user_queries_fts, rowid, lead_name, query)
+            VALUES ('delete', old.id, old.lead_name, old.query);
+        END"""
+    )
+    op.execute(
+        """CREATE TRIGGER IF NOT EXISTS user_queries_fts_update
+        AFTER UPDATE OF lead_name, query ON user_queries BEGIN
+            INSERT INTO user_queries_fts(user_queries_fts, rowid, lead_name, query)
+            VALUES ('delete', old.id, old.lead_name, old.query);
+            INSERT INTO user_queries_fts(rowid, lead_name, query)
+            VALUES (new.id, new.lead_name, new.query);
+        END"""
+    )
+    # Backfill: index every existing lead from the content table
+    op.execute("INSERT INTO user_queries_fts(user_queries_fts) VALUES ('rebuild')")
+    op.execute("INSERT INTO user_queries_fts(user_queries_fts) VALUES ('optimize')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute('DROP TRIGGER IF EXISTS user_queries_fts_update')
+    op.execute('DROP TRIGGER IF EXISTS user_queries_fts_delete')
+    op.execute('DROP TRIGGER IF EXISTS user_queries_fts_insert')
+    op.execute('DROP TABLE IF EXISTS user_queries_fts')
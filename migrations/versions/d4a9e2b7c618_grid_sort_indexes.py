@@ -0,0 +1,36 @@
+"""grid sort indexes
+
+Revision ID: d4a9e2b7c618
+Revises: b6d1e9f4a283
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a9e2b7c618'
+down_revision = 'b6d1e9f4a283'
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    'ix_user_queries_lead_name': ['lead_name'],
+    'ix_user_queries_service': ['service'],
+    'ix_user_queries_status_lead_name': ['status', 'lead_name'],
+    'ix_user_queries_status_service': ['status', 'service'],
+    'ix_user_queries_status_order': [sa.text("coalesce(status, '')")],
+}
+
+
+def upgrade():
+    # Plain CREATE INDEX, so SQLite doesn't rebuild user_queries and drop its
+    # search triggers
+    for name, columns in INDEXES.items():
+        op.create_index(name, 'user_queries', columns, unique=False)
+
+
+def downgrade():
+    for name in reversed(list(INDEXES)):
+        op.drop_index(name, table_name='user_queries')
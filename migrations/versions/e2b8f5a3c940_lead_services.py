@@ -0,0 +1,73 @@
+"""lead services
+
+Revision ID: e2b8f5a3c940
+Revises: 9d4a7c1e6b52
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b8f5a3c940'
+down_revision = '9d4a7c1e6b52'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of models.leads.SERVICES at the time of this migration
+SERVICES = ['haircut', 'massage', 'waxing', 'conditioning', 'styling', 'tanning']
+
+
+# Frozen copy of models.services.split_services
+def split_services(value):
+    names = (name.strip().lower() for name in (value or '').split(','))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def upgrade():
+    services = op.create_table(
+        'services',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name'),
+    )
+    lead_services = op.create_table(
+        'lead_services',
+        sa.Column('lead_id', sa.Integer(), nullable=False),
+        sa.Column('service_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['lead_id'], ['user_queries.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['service_id'], ['services.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('lead_id', 'service_id'),
+    )
+    op.create_index(
+        'ix_lead_services_service_id_lead_id',
+        'lead_services',
+        ['service_id', 'lead_id'],
+        unique=False,
+    )
+
+    # Split every stored service string; names outside the form's list (e.g.
+    # from imports) get their own row
+    connection = op.get_bind()
+    leads = sa.table('user_queries', sa.column('id'), sa.column('service'))
+    names = {}
+    for lead_id, value in connection.execute(sa.select(leads.c.id, leads.c.service)):
+        names[lead_id] = split_services(value)
+    extra = sorted({name for row in names.values() for name in row} - set(SERVICES))
+    op.bulk_insert(services, [{'name': name} for name in SERVICES + extra])
+    ids = dict(connection.execute(sa.select(services.c.name, services.c.id)).all())
+    rows = [
+        {'lead_id': lead_id, 'service_id': ids[name]}
+        for lead_id, row in names.items()
+        for name in row
+    ]
+    if rows:
+        op.bulk_insert(lead_services, rows)
+
+
+def downgrade():
+    op.drop_index('ix_lead_services_service_id_lead_id', table_name='lead_services')
+    op.drop_table('lead_services')
+    op.drop_table('services')
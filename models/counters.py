@@ -0,0 +1,127 @@
+from collections import Counter as Tally
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session
+
+from models.model import Counter, Employee, Query, Service, User, db, lead_services
+
+# Model -> (counter scope, attribute the counts are grouped by)
+TRACKED = {
+    Query: ("user_queries", "status"),
+    User: ("users", "option"),
+    Employee: ("employees", "option"),
+}
+
+# Scope of the leads per service counts, kept by models.services as links
+# are added and dropped
+SERVICE_SCOPE = "services"
+
+counters_cli = AppGroup("counters", help="Maintain the dashboard counters.")
+
+
+def _key(value):
+    return "" if value is None else str(value)
+
+
+# Function to add "deltas" ({(scope, key): n}) to the counters table
+def apply_deltas(connection, deltas):
+    table = Counter.__table__
+    for (scope, key), delta in deltas.items():
+        if not delta:
+            continue
+        result = connection.execute(
+            table.update()
+            .where(table.c.scope == scope, table.c.key == key)
+            .values(value=table.c.value + delta)
+        )
+        if result.rowcount == 0:
+            connection.execute(
+                table.insert().values(scope=scope, key=key, value=delta)
+            )
+
+
+# Function to make "attribute" load its old value before it is set, even on
+# an object expired by a commit, so after_flush listeners see what changed
+def track_history(attribute):
+    event.listen(attribute, "set", lambda *args: None, active_history=True)
+
+
+for model, (_, attr) in TRACKED.items():
+    track_history(getattr(model, attr))
+
+
+# Keep counters in step with every ORM flush, inside the same transaction
+@event.listens_for(Session, "after_flush")
+def _track_counts(session, flush_context):
+    deltas = Tally()
+
+    for obj in session.new:
+        if type(obj) in TRACKED:
+            scope, attr = TRACKED[type(obj)]
+            deltas[(scope, _key(getattr(obj, attr)))] += 1
+
+    for obj in session.deleted:
+        if type(obj) in TRACKED:
+            scope, attr = TRACKED[type(obj)]
+            history = inspect(obj).attrs[attr].history
+            old = history.deleted[0] if history.deleted else getattr(obj, attr)
+            deltas[(scope, _key(old))] -= 1
+
+    for obj in session.dirty:
+        if type(obj) in TRACKED and obj not in session.deleted:
+            scope, attr = TRACKED[type(obj)]
+            history = inspect(obj).attrs[attr].history
+            if history.deleted and history.added:
+                deltas[(scope, _key(history.deleted[0]))] -= 1
+                deltas[(scope, _key(history.added[0]))] += 1
+
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+
+
+# Function to read counters as {scope: {key: value}}, in one query
+def read_counters(*scopes):
+    rows = db.session.query(Counter.scope, Counter.key, Counter.value)
+    if scopes:
+        rows = rows.filter(Counter.scope.in_(scopes))
+    counts = {scope: {} for scope in scopes}
+    for scope, key, value in rows:
+        counts.setdefault(scope, {})[key] = value
+    return counts
+
+
+# Function to recompute every counter from the base tables
+def rebuild_counters():
+    table = Counter.__table__
+    scopes = [scope for scope, _ in TRACKED.values()] + [SERVICE_SCOPE]
+    db.session.execute(table.delete().where(table.c.scope.in_(scopes)))
+    groupings = {}
+    for model, (scope, attr) in TRACKED.items():
+        column = getattr(model, attr)
+        groupings[scope] = db.session.query(column, func.count()).group_by(column)
+    groupings[SERVICE_SCOPE] = (
+        db.session.query(Service.name, func.count())
+        .join(lead_services, lead_services.c.service_id == Service.id)
+        .group_by(Service.name)
+    )
+    totals = {}
+    for scope, query in groupings.items():
+        grouped = query.all()
+        rows = [
+            {"scope": scope, "key": _key(key), "value": value}
+            for key, value in grouped
+        ]
+        if rows:
+            db.session.execute(table.insert(), rows)
+        totals[scope] = sum(row["value"] for row in rows)
+    db.session.commit()
+    return totals
+
+
+@counters_cli.command("rebuild")
+def rebuild_command():
+    """Recount leads, users, employees and services to fix counter drift."""
+    for scope, total in rebuild_counters().items():
+        click.echo(f"{scope}: {total}")
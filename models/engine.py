@@ -0,0 +1,42 @@
+from sqlalchemy import event
+
+from models.model import db
+
+# Production profile for SQLite, applied to every new pooled connection
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",  # readers no longer block the writer
+    "synchronous": "NORMAL",  # fsync at checkpoints only, safe with WAL
+    "busy_timeout": 5000,  # wait up to 5s for a lock instead of failing
+    "cache_size": -32000,  # negative = KiB, so ~32MB page cache
+    "mmap_size": 268435456,  # map up to 256MB of the file
+    "temp_store": "MEMORY",
+}
+
+
+# Function to run the PRAGMA statements of "pragmas" on a DBAPI connection
+def set_pragmas(dbapi_connection, pragmas):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+# Function to hook the SQLite profile onto every engine of "app"
+def apply_engine_profile(app):
+    pragmas = {**SQLITE_PRAGMAS, **app.config.get("SQLITE_PRAGMAS", {})}
+    pragmas = {name: value for name, value in pragmas.items() if value is not None}
+
+    with app.app_context():
+        for bind_key, engine in db.engines.items():
+            if engine.dialect.name != "sqlite" or not pragmas:
+                continue
+            bind_pragmas = dict(pragmas)
+            if bind_key is not None:
+                # Secondary binds (the read replica) may be opened mode=ro
+                bind_pragmas.pop("journal_mode", None)
+
+            @event.listens_for(engine, "connect")
+            def _on_connect(dbapi_connection, record, pragmas=bind_pragmas):
+                set_pragmas(dbapi_connection, pragmas)
@@ -0,0 +1,195 @@
+from collections import Counter as Tally
+
+import click
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from models.counters import apply_deltas, read_counters, track_history
+from models.leads import STATUSES, leads_cli
+from models.model import Counter, Query, StatusEvent, db, utcnow
+
+# The path a lead takes to conversion; "waiting" and "declined" are side exits
+STAGES = ["pending", "call_done", "scheduled", "converted"]
+
+# Counter scopes holding the funnel aggregates, keyed by status
+#   funnel_reached  leads that have ever been in the status
+#   funnel_entered  moves into the status, repeats included
+#   funnel_moves    moves keyed "old>new"
+#   stage_exits     moves out of the status whose start time is known
+#   stage_seconds   total seconds those moves spent in the status
+SCOPES = [
+    "funnel_reached",
+    "funnel_entered",
+    "funnel_moves",
+    "stage_exits",
+    "stage_seconds",
+]
+
+# Leads per history lookup, below SQLite's bound-parameter limit
+CHUNK_SIZE = 900
+
+
+# Function to add one status change to "deltas"
+#
+# "history" is the lead's state so far, {"reached": set of statuses, "since":
+# time it entered its current status}, and is updated in place.
+def fold(deltas, history, old, new, at):
+    deltas[("funnel_entered", new)] += 1
+    if new not in history["reached"]:
+        history["reached"].add(new)
+        deltas[("funnel_reached", new)] += 1
+    if old is not None:
+        deltas[("funnel_moves", f"{old}>{new}")] += 1
+        if history["since"] is not None and at is not None:
+            deltas[("stage_exits", old)] += 1
+            deltas[("stage_seconds", old)] += int(
+                (at - history["since"]).total_seconds()
+            )
+    history["since"] = at
+
+
+# Function to read the logged history of "lead_ids", {lead id: history}
+def lead_histories(connection, lead_ids):
+    table = StatusEvent.__table__
+    histories = {lead_id: {"reached": set(), "since": None} for lead_id in lead_ids}
+    lead_ids = list(histories)
+    for start in range(0, len(lead_ids), CHUNK_SIZE):
+        rows = connection.execute(
+            select(table.c.lead_id, table.c.to_status, table.c.at)
+            .where(table.c.lead_id.in_(lead_ids[start : start + CHUNK_SIZE]))
+            .order_by(table.c.lead_id, table.c.id)
+        )
+        for lead_id, status, at in rows:
+            histories[lead_id]["reached"].add(status)
+            histories[lead_id]["since"] = at
+    return histories
+
+
+# Function to log status changes, [(lead id, old status, new status)], with
+# old None for a new lead, and fold them into the funnel counters
+#
+# Runs on the caller's connection, so the events commit or roll back with the
+# change itself. All events go in as one executemany INSERT.
+def record_transitions(connection, changes, at=None):
+    changes = [(lead_id, old, new) for lead_id, old, new in changes if old != new]
+    if not changes:
+        return
+    at = at or utcnow()
+    # New leads have no history to look up
+    histories = lead_histories(
+        connection, [lead_id for lead_id, old, _ in changes if old is not None]
+    )
+    deltas = Tally()
+    events = []
+    for lead_id, old, new in changes:
+        history = histories.setdefault(lead_id, {"reached": set(), "since": None})
+        fold(deltas, history, old, new, at)
+        events.append(
+            {"lead_id": lead_id, "from_status": old, "to_status": new, "at": at}
+        )
+    connection.execute(StatusEvent.__table__.insert(), events)
+    apply_deltas(connection, deltas)
+
+
+# Moves out of a status are only logged when the old status is known, which
+# on leads expired by a commit takes a load before the new one is set
+track_history(Query.status)
+
+
+# Log every status an ORM flush gives a lead, inside the same transaction
+@event.listens_for(Session, "after_flush")
+def _track_transitions(session, flush_context):
+    changes = []
+    for obj in session.new:
+        if isinstance(obj, Query):
+            changes.append((obj.id, None, obj.status))
+    for obj in session.dirty:
+        if isinstance(obj, Query) and obj not in session.deleted:
+            history = inspect(obj).attrs.status.history
+            if history.deleted and history.added:
+                changes.append((obj.id, history.deleted[0], history.added[0]))
+    if changes:
+        record_transitions(session.connection(), changes)
+
+
+# Function to build the funnel and time-in-stage report from the counters
+def funnel_report():
+    counts = read_counters(*SCOPES)
+    reached = counts["funnel_reached"]
+    stages = []
+    for status in STATUSES:
+        exits = counts["stage_exits"].get(status, 0)
+        seconds = counts["stage_seconds"].get(status, 0)
+        stages.append(
+            {
+                "status": status,
+                "reached": reached.get(status, 0),
+                "entered": counts["funnel_entered"].get(status, 0),
+                "timed_exits": exits,
+                "avg_seconds": round(seconds / exits) if exits else None,
+            }
+        )
+    funnel = []
+    previous = None
+    for status in STAGES:
+        count = reached.get(status, 0)
+        funnel.append(
+            {
+                "status": status,
+                "reached": count,
+                "rate": round(count / previous, 4) if previous else None,
+            }
+        )
+        previous = count
+    return {"funnel": funnel, "stages": stages, "moves": counts["funnel_moves"]}
+
+
+# Function to recompute the funnel counters by replaying the event log
+def rebuild_funnel():
+    table = Counter.__table__
+    db.session.execute(table.delete().where(table.c.scope.in_(SCOPES)))
+    deltas = Tally()
+    histories = {}
+    events = db.session.execute(
+        select(
+            StatusEvent.lead_id,
+            StatusEvent.from_status,
+            StatusEvent.to_status,
+            StatusEvent.at,
+        )
+        .order_by(StatusEvent.lead_id, StatusEvent.id)
+        .execution_options(yield_per=1000)
+    )
+    total = 0
+    for lead_id, old, new, at in events:
+        history = histories.setdefault(lead_id, {"reached": set(), "since": None})
+        fold(deltas, history, old, new, at)
+        total += 1
+    apply_deltas(db.session.connection(), deltas)
+    db.session.commit()
+    return total
+
+
+def _duration(seconds):
+    if seconds is None:
+        return "-"
+    hours, seconds = divmod(seconds, 3600)
+    return f"{hours}h {seconds // 60:02d}m"
+
+
+@leads_cli.command("funnel")
+@click.option("--rebuild", is_flag=True, help="Replay the event log first.")
+def funnel_command(rebuild):
+    """Print the conversion funnel and average time in each status."""
+    if rebuild:
+        click.echo(f"Replayed {rebuild_funnel()} status events.")
+    report = funnel_report()
+    for stage in report["funnel"]:
+        rate = "" if stage["rate"] is None else f"  ({stage['rate']:.1%})"
+        click.echo(f"{stage['status']:<10} {stage['reached']:>8}{rate}")
+    click.echo()
+    for stage in report["stages"]:
+        click.echo(
+            f"{stage['status']:<10} entered {stage['entered']:>8}  "
+            f"avg stay {_duration(stage['avg_seconds'])}"
+        )
@@ -0,0 +1,84 @@
+from sqlalchemy import exists, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from models.counters import TRACKED, apply_deltas
+from models.funnel import record_transitions
+from models.model import Query, db
+from models.phones import canonical_phone
+from models.services import link_services
+
+# Dialects that understand INSERT ... ON CONFLICT DO NOTHING
+INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+# Function to claim a row in one INSERT ... SELECT ... ON CONFLICT statement
+#
+# "guards" maps a key name to a boolean clause (e.g. a phone lookup in another
+# table) that must be false for the row to go in. The table's own unique
+# columns are enforced by their constraints. Returns (new id, None) on success
+# or (None, name of the key that collided).
+def insert_unique(model, values, guards=None):
+    guards = guards or {}
+    table = model.__table__
+    insert = INSERTS[db.engine.dialect.name]
+
+    row = select(
+        *[literal(value, table.c[name].type) for name, value in values.items()]
+    )
+    # SQLite needs a WHERE before ON CONFLICT to parse INSERT ... SELECT
+    row = row.where(literal(True))
+    for clause in guards.values():
+        row = row.where(~clause)
+
+    statement = (
+        insert(table)
+        .from_select(list(values), row)
+        .on_conflict_do_nothing()
+        .returning(table.c.id)
+    )
+    new_id = db.session.execute(statement).scalar()
+
+    if new_id is not None:
+        scope, attr = TRACKED[model]
+        default = table.c[attr].default
+        key = values.get(attr, default.arg if default is not None else None)
+        apply_deltas(db.session.connection(), {(scope, key or ""): 1})
+        if model is Query:
+            record_transitions(db.session.connection(), [(new_id, None, key)])
+            link_services(db.session.connection(), {new_id: values["service"]})
+        return new_id, None
+    return None, collided_key(model, values, guards)
+
+
+# Function to name the first unique key or guard that blocks "values"
+def collided_key(model, values, guards):
+    table = model.__table__
+    probes = [
+        (column.name, exists().where(column == values[column.name]))
+        for column in table.c
+        if column.unique and column.name in values
+    ]
+    probes += list(guards.items())
+    found = db.session.execute(
+        select(*[clause.label(f"probe_{i}") for i, (_, clause) in enumerate(probes)])
+    ).one()
+    for (name, _), hit in zip(probes, found):
+        if hit:
+            return name
+    return None
+
+
+# Guards: does the value already belong to another table?
+def phone_in(model, phone_number):
+    return exists().where(model.phone == canonical_phone(phone_number))
+
+
+def email_in(model, email):
+    return exists().where(model.email == email)
+
+
+def phone_has_other_lead(phone_number, lead_name):
+    return exists().where(
+        Query.phone == canonical_phone(phone_number), Query.lead_name != lead_name
+    )
+
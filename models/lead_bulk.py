@@ -0,0 +1,66 @@
+from collections import Counter as Tally
+
+from sqlalchemy import delete, select, update
+
+from models.counters import apply_deltas
+from models.funnel import record_transitions
+from models.model import Query, db
+from models.services import unlink_services
+
+# Ids per statement, below SQLite's bound-parameter limit
+CHUNK_SIZE = 900
+
+
+def _chunks(ids):
+    for start in range(0, len(ids), CHUNK_SIZE):
+        yield ids[start : start + CHUNK_SIZE]
+
+
+# Function to read ids from a JSON list or repeated form fields, or None if
+# any of them isn't an integer
+def parse_ids(values):
+    try:
+        return sorted({int(value) for value in values})
+    except (TypeError, ValueError):
+        return None
+
+
+# Function to set "status" on every lead in "ids" in one transaction
+#
+# Leads already in "status" are left alone; the rest are logged as status
+# events in one batch. Returns how many rows changed.
+def update_statuses(ids, status):
+    table = Query.__table__
+    deltas = Tally()
+    changes = []
+    updated = 0
+    for chunk in _chunks(ids):
+        changing = table.c.id.in_(chunk) & table.c.status.is_distinct_from(status)
+        olds = db.session.execute(select(table.c.id, table.c.status).where(changing))
+        for lead_id, old in olds:
+            deltas[("user_queries", old or "")] -= 1
+            deltas[("user_queries", status)] += 1
+            changes.append((lead_id, old, status))
+        updated += db.session.execute(
+            update(table).where(changing).values(status=status)
+        ).rowcount
+    apply_deltas(db.session.connection(), deltas)
+    record_transitions(db.session.connection(), changes)
+    db.session.commit()
+    return updated
+
+
+# Function to delete every lead in "ids" in one transaction, returning how
+# many rows went
+def delete_many(ids):
+    table = Query.__table__
+    deltas = Tally()
+    for chunk in _chunks(ids):
+        for (status,) in db.session.execute(
+            delete(table).where(table.c.id.in_(chunk)).returning(table.c.status)
+        ):
+            deltas[("user_queries", status or "")] -= 1
+        unlink_services(db.session.connection(), chunk)
+    apply_deltas(db.session.connection(), deltas)
+    db.session.commit()
+    return -sum(deltas.values())
@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+
+import click
+from sqlalchemy import select
+
+from models.leads import SERVICES, STATUSES, leads_cli
+from models.model import Query, db
+from models.services import join_service
+
+BATCH_SIZE = 2000
+
+COLUMNS = ["id", "lead_name", "service", "phone_number", "query", "status"]
+
+MIMETYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+# Function to build the export SELECT for optional status/service filters
+def export_statement(status=None, service=None):
+    statement = select(*[getattr(Query, name) for name in COLUMNS])
+    order = Query.id
+    if status:
+        statement = statement.where(Query.status == status)
+    if service:
+        statement, order = join_service(statement, service)
+    return statement.order_by(order)
+
+
+# Function to stream leads as chunks of CSV or NDJSON text
+#
+# Rows come from a server-side cursor in batches of "batch_size", and each
+# batch is encoded and yielded before the next one is fetched, so memory use
+# does not grow with the table.
+def export_leads(fmt="csv", status=None, service=None, batch_size=BATCH_SIZE):
+    if fmt not in MIMETYPES:
+        raise ValueError(f"unsupported format: {fmt}")
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if fmt == "csv":
+        writer.writerow(COLUMNS)
+        yield buffer.getvalue()
+
+    statement = export_statement(status, service).execution_options(
+        yield_per=batch_size
+    )
+    result = db.session.execute(statement)
+    for rows in result.partitions():
+        buffer.seek(0)
+        buffer.truncate()
+        if fmt == "csv":
+            writer.writerows(rows)
+        else:
+            for row in rows:
+                buffer.write(json.dumps(dict(zip(COLUMNS, row))))
+                buffer.write("\n")
+        yield buffer.getvalue()
+
+
+# Function to read export filters from request args, dropping unknown values
+def export_filters(args):
+    status = args.get("status")
+    service = args.get("service")
+    return {
+        "status": status if status in STATUSES else None,
+        "service": service if service in SERVICES else None,
+    }
+
+
+@leads_cli.command("export")
+@click.option("--format", "fmt", type=click.Choice(list(MIMETYPES)), default="csv")
+@click.option("--status", type=click.Choice(STATUSES))
+@click.option("--service", type=click.Choice(SERVICES))
+@click.option("--output", "-o", type=click.File("w"), default="-")
+@click.option("--batch-size", default=BATCH_SIZE, show_default=True)
+def export_command(fmt, status, service, output, batch_size):
+    """Stream leads to a CSV or NDJSON file (stdout by default)."""
+    for chunk in export_leads(fmt, status, service, batch_size):
+        output.write(chunk)
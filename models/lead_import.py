@@ -0,0 +1,157 @@
+import csv
+import json
+from collections import Counter as Tally
+
+import click
+from sqlalchemy import insert, select, union
+
+from models.counters import apply_deltas
+from models.funnel import record_transitions
+from models.leads import STATUSES, lead_error, leads_cli
+from models.model import Employee, Query, User, db
+from models.phones import canonical_phone
+from models.services import link_services
+
+BATCH_SIZE = 5000
+
+
+# Function to read (line number, row dict) pairs from a text stream, lazily
+def iter_rows(stream, fmt):
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == "jsonl":
+        for line_num, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield line_num, row if isinstance(row, dict) else None
+    else:
+        raise ValueError(f"unsupported format: {fmt}")
+
+
+# Function to guess the import format from a file name
+def format_for(filename, default="csv"):
+    name = (filename or "").lower()
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if name.endswith(".csv"):
+        return "csv"
+    return default
+
+
+# Function to turn a raw row into Query column values, or a reject reason
+def clean_row(row):
+    if row is None:
+        return None, "unreadable row"
+    service = row.get("service") or ""
+    if isinstance(service, list):
+        service = ", ".join(str(item) for item in service)
+    values = {
+        "lead_name": str(row.get("lead_name") or "").strip(),
+        "service": str(service).strip(),
+        "phone_number": str(row.get("phone_number") or "").strip(),
+        "query": str(row.get("query") or "").strip(),
+        "status": row.get("status") or "pending",
+    }
+    error = lead_error(
+        values["lead_name"], values["service"], values["phone_number"], values["query"]
+    )
+    if error is None and values["status"] not in STATUSES:
+        error = "unknown status"
+    if error:
+        return None, error
+    values["phone"] = values["phone_number"] = canonical_phone(values["phone_number"])
+    return values, None
+
+
+# Function to return which of "phones" already belong to a lead or an account
+def existing_phones(phones):
+    lookup = union(
+        select(Query.phone).where(Query.phone.in_(phones)),
+        select(User.phone).where(User.phone.in_(phones)),
+        select(Employee.phone).where(Employee.phone.in_(phones)),
+    )
+    return set(db.session.execute(lookup).scalars())
+
+
+def _flush(batch, stats, on_reject):
+    taken = existing_phones([values["phone"] for _, values in batch])
+    rows = []
+    for line_num, values in batch:
+        if values["phone"] in taken:
+            stats["duplicates"] += 1
+            on_reject(line_num, "phone_number already exists")
+        else:
+            rows.append(values)
+    if rows:
+        table = Query.__table__
+        created = db.session.execute(
+            insert(table).returning(table.c.id, table.c.status, table.c.service),
+            rows,
+        ).all()
+        statuses = Tally(("user_queries", values["status"]) for values in rows)
+        apply_deltas(db.session.connection(), statuses)
+        record_transitions(
+            db.session.connection(),
+            [(lead_id, None, status) for lead_id, status, _ in created],
+        )
+        link_services(
+            db.session.connection(),
+            {lead_id: service for lead_id, _, service in created},
+        )
+    db.session.commit()
+    stats["imported"] += len(rows)
+
+
+# Function to import leads from an iterable of (line number, row) pairs
+#
+# Rows are validated with the all_leads_add rules, then deduplicated one batch
+# at a time, against the batch itself and against every stored phone number,
+# earlier batches' included. Each batch is a single executemany INSERT
+# committed in its own transaction, so memory use stays flat however long the
+# file is.
+def import_leads(rows, batch_size=BATCH_SIZE, on_reject=lambda line, reason: None):
+    stats = {"read": 0, "imported": 0, "invalid": 0, "duplicates": 0}
+    seen = set()  # Phones in the current batch
+    batch = []
+    for line_num, row in rows:
+        stats["read"] += 1
+        values, error = clean_row(row)
+        if error:
+            stats["invalid"] += 1
+            on_reject(line_num, error)
+            continue
+        if values["phone"] in seen:
+            stats["duplicates"] += 1
+            on_reject(line_num, "phone_number repeated in file")
+            continue
+        seen.add(values["phone"])
+        batch.append((line_num, values))
+        if len(batch) >= batch_size:
+            _flush(batch, stats, on_reject)
+            seen = set()
+            batch = []
+    if batch:
+        _flush(batch, stats, on_reject)
+    return stats
+
+
+@leads_cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "fmt", type=click.Choice(["csv", "jsonl"]))
+@click.option("--batch-size", default=BATCH_SIZE, show_default=True)
+def import_command(path, fmt, batch_size):
+    """Stream leads from a CSV or JSONL file into user_queries."""
+    fmt = fmt or format_for(path)
+
+    def report(line_num, reason):
+        click.echo(f"line {line_num}: {reason}", err=True)
+
+    with open(path, encoding="utf-8", newline="") as stream:
+        stats = import_leads(iter_rows(stream, fmt), batch_size, on_reject=report)
+    click.echo(", ".join(f"{name}: {count}" for name, count in stats.items()))
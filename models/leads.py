@@ -0,0 +1,210 @@
+from flask.cli import AppGroup
+from sqlalchemy import and_
+
+from models.model import STATUS_ORDER, Query, User, db
+from models.pagination import (
+    CursorPage,
+    cursor_paginate,
+    decode_cursor,
+    encode_cursor,
+    page_size,
+)
+from models.phones import canonical_phone
+from models.search import UNRANKED, match_expression, older_matches, search_leads
+from models.services import has_service, join_service
+
+leads_cli = AppGroup("leads", help="Bulk lead import and export.")
+
+STATUSES = ["pending", "call_done", "waiting", "scheduled", "converted", "declined"]
+
+SERVICES = ["haircut", "massage", "waxing", "conditioning", "styling", "tanning"]
+
+# Sort name -> (SQL expression, value read back from a row for the cursor)
+SORTS = {
+    "id": (Query.id, lambda lead: lead.id),
+    "lead_name": (Query.lead_name, lambda lead: lead.lead_name),
+    "service": (Query.service, lambda lead: lead.service),
+    "status": (STATUS_ORDER, lambda lead: lead.status or ""),
+}
+
+
+# Function to check a lead the way all_leads_add does, returning the problem
+def lead_error(lead_name, service, phone_number, query):
+    if not lead_name:
+        return "missing lead_name"
+    if canonical_phone(phone_number) is None:
+        return "phone_number must be 10 digits"
+    if not service:
+        return "missing service"
+    if not query or len(query) < 5 or len(query) > 50:
+        return "query must be 5 to 50 characters"
+    return None
+
+
+# Function to read grid filters from request args, dropping unknown values
+def grid_filters(args):
+    status = args.get("status") or None
+    service = args.get("service") or None
+    sort = args.get("sort", "id")
+    order = args.get("order", "asc")
+    q = (args.get("q") or "").strip()
+    return {
+        "q": q if match_expression(q) else None,
+        "status": status if status in STATUSES else None,
+        "service": service if service in SERVICES else None,
+        "sort": sort if sort in SORTS else "id",
+        "order": order if order in ("asc", "desc") else "asc",
+    }
+
+
+# Function to fetch one screen of leads matching "filters"
+#
+# With a search text ("q") the screen is ranked by relevance, see search_page(),
+# and "sort" and "order" are ignored.
+def lead_grid(filters, cursor=None):
+    query = db.session.query(Query)
+    if filters["status"]:
+        query = query.filter(Query.status == filters["status"])
+
+    # The FTS join goes before the service one: it joins on Query.id, which is
+    # ambiguous once lead_services is in the FROM list
+    if filters["q"]:
+        matches, rank = search_leads(query, filters["q"])
+        if rank is not None:
+            return search_page(query, matches, rank, filters, cursor)
+        query = matches
+
+    query, sort_column, id_column = sorted_grid(query, filters)
+    sort_value = SORTS[filters["sort"]][1]
+    return cursor_paginate(
+        query,
+        sort_column,
+        id_column,
+        key_of=lambda lead: (sort_value(lead), lead.id),
+        per_page=page_size("LEAD_PAGE_SIZE", 25),
+        cursor=cursor,
+        descending=filters["order"] == "desc",
+    )
+
+
+# Function to apply the service filter and sort of "filters" to "query" (over
+# Query), already filtered by status
+#
+# Returns (query, sort column, id column) to seek on, the columns the indexes
+# behind each filter and sort can walk in order.
+def sorted_grid(query, filters):
+    sort_column = SORTS[filters["sort"]][0]
+    # Leads filtered to one status are already in status order
+    if filters["status"] and filters["sort"] == "status":
+        sort_column = Query.id
+    id_column = Query.id
+    if filters["service"] and sort_column is Query.id:
+        query, id_column = join_service(query, filters["service"])
+        sort_column = id_column
+    elif filters["service"]:
+        query = query.filter(has_service(filters["service"]))
+    return query, sort_column, id_column
+
+
+# Function to fetch one screen of FTS5 search results: the ranked matches best
+# first, then the older, unranked ones newest first. Cursors into the older
+# matches carry UNRANKED in place of a rank.
+def search_page(query, matches, rank, filters, cursor):
+    older, rowid = older_matches(query, filters["q"])
+    if filters["service"]:
+        matches, _ = join_service(matches, filters["service"])
+        older, _ = join_service(older, filters["service"])
+    per_page = page_size("LEAD_PAGE_SIZE", 25)
+
+    def older_page(cursor):
+        page = cursor_paginate(
+            older,
+            rowid,
+            rowid,
+            key_of=lambda lead: (UNRANKED, lead.id),
+            per_page=per_page,
+            cursor=cursor,
+            descending=True,
+        )
+        # The first older page leads back to the last ranked one
+        if page.items and page.prev_cursor is None:
+            if matches.with_entities(Query.id).first() is not None:
+                first = [UNRANKED, page.items[0].id]
+                page.prev_cursor = encode_cursor("before", first)
+        return page
+
+    direction, values = decode_cursor(cursor)
+    if values and values[0] == UNRANKED:
+        page = older_page(cursor)
+        if page.items or direction != "before":
+            return page
+
+    page = cursor_paginate(
+        matches,
+        rank,
+        Query.id,
+        key_of=lambda row: (row.rank, row.Query.id),
+        per_page=per_page,
+        cursor=cursor,
+    )
+    page.items = [row.Query for row in page.items]
+    if page.next_cursor is None and direction != "before":
+        newest = older.with_entities(rowid).order_by(rowid.desc()).limit(1).scalar()
+        if newest is not None and not page.items:
+            return older_page(None)
+        if newest is not None:
+            page.next_cursor = encode_cursor("after", [UNRANKED, newest + 1])
+    return page
+
+
+# Function to fetch an account and one page of its leads, newest first, in a
+# single join on the canonical phone. The cursor bounds the join rather than
+# the WHERE clause, so the account row comes back even on an empty page.
+# Returns (user, page), or (None, None) if there is no such account.
+def query_history(email, cursor=None):
+    direction, values = decode_cursor(cursor)
+    if not (values and isinstance(values[0], int)):
+        direction = None
+    backwards = direction == "before"
+
+    on = Query.phone == User.phone
+    if direction is not None:
+        on = and_(on, Query.id > values[0] if backwards else Query.id < values[0])
+
+    per_page = page_size("HISTORY_PAGE_SIZE", 10)
+    rows = (
+        db.session.query(User, Query)
+        .outerjoin(Query, on)
+        .filter(User.email == email)
+        .order_by(Query.id.asc() if backwards else Query.id.desc())
+        .limit(per_page + 1)
+        .all()
+    )
+    if not rows:
+        return None, None
+
+    items = [row.Query for row in rows if row.Query is not None]
+    has_more = len(items) > per_page
+    items = items[:per_page]
+    if backwards:
+        items.reverse()
+
+    next_cursor = prev_cursor = None
+    if items:
+        if has_more or backwards:
+            next_cursor = encode_cursor("after", [items[-1].id])
+        if (has_more and backwards) or direction == "after":
+            prev_cursor = encode_cursor("before", [items[0].id])
+    return rows[0].User, CursorPage(items, per_page, next_cursor, prev_cursor)
+
+
+# Function to serialize a lead for the JSON endpoints
+def lead_to_dict(lead):
+    return {
+        "id": lead.id,
+        "lead_name": lead.lead_name,
+        "service": lead.service,
+        "phone_number": lead.phone_number,
+        "query": lead.query,
+        "status": lead.status,
+    }
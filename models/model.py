@@ -1,16 +1,46 @@
+from datetime import datetime, timezone
+
 from flask_sqlalchemy import SQLAlchemy
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy.orm import validates
+
+from models.passwords import hash_password
+from models.phones import require_phone
+from models.replica import RoutingSession
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+
+
+# Keeps "phone", the canonical number every lookup compares, in step with
+# "phone_number", which is stored canonicalized too. Raises ValueError for an
+# invalid number, so callers should check canonical_phone() first.
+class CanonicalPhone:
+    @validates("phone_number")
+    def _set_phone(self, key, value):
+        self.phone = require_phone(value)
+        return self.__table__.c.phone_number.type.python_type(self.phone)
+
 
-db = SQLAlchemy()
+# Function to return the current UTC time as stored in DateTime columns,
+# without tzinfo
+def utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# Adds "created_at", set on insert, and "updated_at", set on every insert or
+# UPDATE (Core ones included). Rows older than the columns hold NULL.
+class Timestamps:
+    created_at = db.Column(db.DateTime, default=utcnow, index=True)
+    updated_at = db.Column(db.DateTime, default=utcnow, onupdate=utcnow)
 
 
 # Employee model for "employees" table
-class Employee(db.Model):
+class Employee(CanonicalPhone, Timestamps, db.Model):
     __tablename__ = "employees"
     id = db.Column(db.Integer, primary_key=True)
     lead_name = db.Column(db.String, nullable=False)
     email = db.Column(db.String, unique=True, nullable=False)
     phone_number = db.Column(db.Integer, unique=True, nullable=False)
+    phone = db.Column(db.String(10), unique=True, index=True)
     password = db.Column(db.String, nullable=False)
     option = db.Column(db.String, nullable=False)
 
@@ -18,16 +48,17 @@ class Employee(db.Model):
         self.lead_name = lead_name
         self.email = email
         self.phone_number = phone_number
-        self.password = generate_password_hash(password)
+        self.password = hash_password(password)
         self.option = option
 
 
-class User(db.Model):
+class User(CanonicalPhone, Timestamps, db.Model):
     __tablename__ = "users"
     id = db.Column(db.Integer, primary_key=True)
-    lead_name = db.Column(db.String, nullable=False)
+    lead_name = db.Column(db.String, nullable=False, index=True)
     email = db.Column(db.String, unique=True, nullable=False)
     phone_number = db.Column(db.Integer, unique=True, nullable=False)
+    phone = db.Column(db.String(10), unique=True, index=True)
     password = db.Column(db.String, nullable=False)
     option = db.Column(db.String, nullable=False, default="user")
 
@@ -35,21 +66,99 @@ class User(db.Model):
         self.lead_name = lead_name
         self.email = email
         self.phone_number = phone_number
-        self.password = generate_password_hash(password)  # Hash the password
+        self.password = hash_password(password)  # Hash the password
 
 
 # Query model for "query" table
-class Query(db.Model):
+class Query(CanonicalPhone, Timestamps, db.Model):
     __tablename__ = "user_queries"
+    # Leading phone also serves the phone-only duplicate checks. The status
+    # ones serve the grid's sorts within one status.
+    __table_args__ = (
+        db.Index("ix_user_queries_phone_lead_name", "phone", "lead_name"),
+        db.Index("ix_user_queries_status_lead_name", "status", "lead_name"),
+        db.Index("ix_user_queries_status_service", "status", "service"),
+    )
     id = db.Column(db.Integer, primary_key=True)
-    lead_name = db.Column(db.String, nullable=False)
-    service = db.Column(db.String, nullable=False)
+    # The grid sorts by these; SQLite ends each index with the id, so they
+    # also order ties by id
+    lead_name = db.Column(db.String, nullable=False, index=True)
+    service = db.Column(db.String, nullable=False, index=True)
     phone_number = db.Column(db.String, nullable=False)
+    phone = db.Column(db.String(10))
     query = db.Column(db.String, nullable=False)
-    status = db.Column(db.String, default="pending")
+    status = db.Column(db.String, default="pending", index=True)
 
     def __init__(self, lead_name, service, phone_number, query):
         self.lead_name = lead_name
         self.service = service
         self.phone_number = phone_number
         self.query = query
+
+
+# The grid's status sort, with leads without a status first. The literal ''
+# (not a bound parameter) lets SQLite match it to the index below.
+STATUS_ORDER = db.func.coalesce(Query.status, db.literal_column("''"))
+db.Index("ix_user_queries_status_order", STATUS_ORDER)
+
+
+# Service model for "services" table, the lookup of service names
+class Service(db.Model):
+    __tablename__ = "services"
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String, unique=True, nullable=False)
+
+
+# Association of leads with their services, kept in step with the
+# "service" string of each lead by models.services. The primary key serves
+# per-lead lookups, the index per-service filters and counts.
+lead_services = db.Table(
+    "lead_services",
+    db.Column(
+        "lead_id",
+        db.Integer,
+        db.ForeignKey("user_queries.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    db.Column(
+        "service_id",
+        db.Integer,
+        db.ForeignKey("services.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    db.Index("ix_lead_services_service_id_lead_id", "service_id", "lead_id"),
+)
+
+
+# DailyRollup model for "daily_rollups" table, per-day counts maintained by
+# models.rollups. The primary key's leading "day" serves date range reads.
+class DailyRollup(db.Model):
+    __tablename__ = "daily_rollups"
+    day = db.Column(db.Date, primary_key=True)
+    dimension = db.Column(db.String, primary_key=True)
+    key = db.Column(db.String, primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+
+# Counter model for "dashboard_counters" table
+class Counter(db.Model):
+    __tablename__ = "dashboard_counters"
+    scope = db.Column(db.String, primary_key=True)
+    key = db.Column(db.String, primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+
+# StatusEvent model for "lead_status_events" table, an append-only log of the
+# statuses each lead has been moved into. Rows are never updated and outlive
+# the lead, so "lead_id" has no foreign key.
+class StatusEvent(db.Model):
+    __tablename__ = "lead_status_events"
+    # Serves the per-lead history lookups made while recording a transition
+    __table_args__ = (
+        db.Index("ix_lead_status_events_lead_id_to_status", "lead_id", "to_status"),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    lead_id = db.Column(db.Integer, nullable=False)
+    from_status = db.Column(db.String)  # None when the lead was created
+    to_status = db.Column(db.String, nullable=False)
+    at = db.Column(db.DateTime)  # UTC; None for statuses set before logging
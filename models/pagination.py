@@ -0,0 +1,214 @@
+import base64
+import json
+import math
+
+from flask import current_app
+from sqlalchemy import func, tuple_
+
+from models.model import db
+
+
+# Page of rows fetched with keyset (seek) pagination on a unique, ordered column
+class KeysetPage:
+    def __init__(self, items, page, per_page, total, has_prev, has_next):
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.total = total
+        self.has_prev = has_prev
+        self.has_next = has_next
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def pages(self):
+        return max(1, math.ceil(self.total / self.per_page))
+
+    @property
+    def prev_num(self):
+        return max(1, self.page - 1)
+
+    @property
+    def next_num(self):
+        return self.page + 1
+
+    # Cursor to pass as "before" to reach the previous page
+    @property
+    def first_id(self):
+        return self.items[0].id if self.items else None
+
+    # Cursor to pass as "after" to reach the next page
+    @property
+    def last_id(self):
+        return self.items[-1].id if self.items else None
+
+
+# Page that is only fetched when a template first reads it, so a cached
+# fragment ({% cache %}) can skip the query entirely
+class LazyPage:
+    def __init__(self, fetch, *args, **kwargs):
+        self._fetch = lambda: fetch(*args, **kwargs)
+        self._page = None
+
+    def _load(self):
+        if self._page is None:
+            self._page = self._fetch()
+        return self._page
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __iter__(self):
+        return iter(self._load())
+
+    def __len__(self):
+        return len(self._load())
+
+
+# Function to read the configured page size for admin listings
+def page_size(key="ADMIN_PAGE_SIZE", default=10):
+    per_page = current_app.config.get(key, default)
+    return max(1, min(int(per_page), 500))
+
+
+# Function to fetch one page of "model" ordered by id, seeking from a cursor
+def keyset_paginate(model, page=1, per_page=10, after=None, before=None, query=None):
+    query = query if query is not None else db.session.query(model)
+    column = model.id
+
+    # Single COUNT over the primary key index instead of loading every row
+    total = query.with_entities(func.count(column)).order_by(None).scalar()
+
+    if before is not None:
+        rows = (
+            query.filter(column < before)
+            .order_by(column.desc())
+            .limit(per_page + 1)
+            .all()
+        )
+        has_prev = len(rows) > per_page
+        items = list(reversed(rows[:per_page]))
+        has_next = True
+    else:
+        if after is not None:
+            query = query.filter(column > after)
+        rows = query.order_by(column.asc()).limit(per_page + 1).all()
+        has_next = len(rows) > per_page
+        items = rows[:per_page]
+        has_prev = after is not None
+
+    if not items:
+        has_prev = has_next = False
+
+    return KeysetPage(
+        items,
+        page=max(1, page),
+        per_page=per_page,
+        total=total,
+        has_prev=has_prev,
+        has_next=has_next,
+    )
+
+
+# Function to encode a sort key as an opaque, URL-safe cursor
+def encode_cursor(direction, values):
+    raw = json.dumps({direction: list(values)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+# Function to decode a cursor, returning (direction, values) or (None, None)
+def decode_cursor(cursor):
+    if not cursor:
+        return None, None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        (direction, values), = data.items()
+    except (ValueError, TypeError, AttributeError):
+        return None, None
+    if direction not in ("after", "before") or not isinstance(values, list):
+        return None, None
+    return direction, values
+
+
+# Page of rows fetched by seeking on a (sort value, id) cursor
+class CursorPage:
+    def __init__(self, items, per_page, next_cursor=None, prev_cursor=None):
+        self.items = items
+        self.per_page = per_page
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+
+# Function to order "query" by (sort_column, id_column) and bound it to the
+# rows after or before a (sort value, id) cursor position, "values"
+def seek(query, sort_column, id_column, direction, values, descending=False):
+    backwards = direction == "before"
+    # Sorting by the id itself seeks on the one column; a (id, id) row value
+    # would make SQLite sort again
+    columns = [id_column] if sort_column is id_column else [sort_column, id_column]
+    key = tuple_(*columns) if len(columns) > 1 else id_column
+
+    if direction is not None:
+        bound = tuple_(*values) if len(columns) > 1 else values[-1]
+        query = query.filter(key < bound if backwards != descending else key > bound)
+        # SQLite only seeks on a row value's first column, and on an index
+        # over an expression not at all, unless that is also bounded alone
+        if len(columns) > 1:
+            query = query.filter(
+                sort_column <= values[0]
+                if backwards != descending
+                else sort_column >= values[0]
+            )
+
+    if backwards != descending:
+        return query.order_by(*[column.desc() for column in columns])
+    return query.order_by(*[column.asc() for column in columns])
+
+
+# Function to fetch one page ordered by (sort_column, id_column) after/before a cursor
+def cursor_paginate(
+    query, sort_column, id_column, key_of, per_page=25, cursor=None, descending=False
+):
+    direction, values = decode_cursor(cursor)
+    # Cursors always hold key_of()'s (sort value, id); anything else was not
+    # made here and starts from the first page
+    if direction is not None and (
+        len(values) != 2 or any(isinstance(value, (list, dict)) for value in values)
+    ):
+        direction = values = None
+    backwards = direction == "before"
+    query = seek(query, sort_column, id_column, direction, values, descending)
+
+    rows = query.limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    items = rows[:per_page]
+    if backwards:
+        items.reverse()
+
+    next_cursor = prev_cursor = None
+    if items:
+        if (has_more and not backwards) or backwards:
+            next_cursor = encode_cursor("after", key_of(items[-1]))
+        if (has_more and backwards) or direction == "after":
+            prev_cursor = encode_cursor("before", key_of(items[0]))
+
+    return CursorPage(items, per_page, next_cursor, prev_cursor)
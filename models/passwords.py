@@ -0,0 +1,71 @@
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash, generate_password_hash
+
+DEFAULT_METHOD = "scrypt:32768:8:1"
+
+_pool = None
+
+
+def _config(key, default):
+    if has_app_context():
+        return current_app.config.get(key, default)
+    return default
+
+
+# Bounded pool so hashing can never occupy more than N threads at once
+def _executor():
+    global _pool
+    if _pool is None:
+        workers = _config("PASSWORD_HASH_WORKERS", None) or os.cpu_count() or 1
+        _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwhash")
+    return _pool
+
+
+# Function to return the configured "algorithm:cost" method string
+def hash_method():
+    return _config("PASSWORD_HASH_METHOD", DEFAULT_METHOD)
+
+
+# Function to hash a password on the worker pool
+def hash_password(password):
+    method = hash_method()
+    return _executor().submit(generate_password_hash, password, method).result()
+
+
+# Function to return the method prefix werkzeug stores for "method", which
+# spells out the costs it leaves implicit: "scrypt" is stored as
+# "scrypt:32768:8:1" and "pbkdf2:sha256" as "pbkdf2:sha256:1000000"
+@lru_cache
+def stored_method(method):
+    return generate_password_hash("", method).split("$", 1)[0]
+
+
+# Function to check whether a stored value was made with an older method
+def needs_rehash(stored):
+    if "$" not in stored:
+        return True
+    return stored.split("$", 1)[0] != stored_method(hash_method())
+
+
+# Function to verify a password on the worker pool
+def verify_password(stored, password):
+    if not stored or not password:
+        return False
+    # Legacy rows written before hashing was enforced hold the plain value
+    if "$" not in stored:
+        return hmac.compare_digest(stored.encode(), password.encode())
+    return _executor().submit(check_password_hash, stored, password).result()
+
+
+# Function to verify "account" and upgrade its stored hash in place if needed
+def verify_and_upgrade(account, password):
+    if not verify_password(account.password, password):
+        return False
+    if needs_rehash(account.password):
+        account.password = hash_password(password)
+    return True
@@ -0,0 +1,26 @@
+import re
+
+
+# Function to reduce a phone number to its canonical form, the 10-digit
+# national number as a string, or None if it isn't a valid phone number
+#
+# Spaces and punctuation are dropped, as are a +91 country code and a leading
+# 0 trunk prefix, so "+91 98765-43210", "098765 43210" and 9876543210 all
+# become "9876543210".
+def canonical_phone(value):
+    if value is None:
+        return None
+    digits = re.sub(r"\D", "", str(value))
+    if len(digits) == 12 and digits.startswith("91"):
+        digits = digits[2:]
+    elif len(digits) == 11 and digits.startswith("0"):
+        digits = digits[1:]
+    return digits if len(digits) == 10 else None
+
+
+# Function to return the canonical phone number or raise ValueError
+def require_phone(value):
+    phone = canonical_phone(value)
+    if phone is None:
+        raise ValueError(f"invalid phone number: {value!r}")
+    return phone
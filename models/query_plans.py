@@ -0,0 +1,119 @@
+from itertools import product
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import select, text
+
+from models.leads import SORTS, sorted_grid
+from models.model import Employee, Query, User, db
+from models.pagination import seek
+from models.services import join_service
+
+indexes_cli = AppGroup("indexes", help="Inspect index usage of hot queries.")
+
+PHONE = "9876543210"
+EMAIL = "someone@gmail.com"
+
+BY_SERVICE, LINKED_ID = join_service(select(Query), "haircut")
+
+# Lookups issued on every request by the handlers in app.py
+HOT_QUERIES = {
+    "signup: lead by phone": select(Query).filter_by(phone=PHONE),
+    "signup: lead by name and phone": select(Query).filter_by(
+        lead_name="Someone", phone=PHONE
+    ),
+    "signup: user by phone and email": select(User).filter_by(
+        phone=PHONE, email=EMAIL
+    ),
+    "login: user by email": select(User).filter_by(email=EMAIL),
+    "login: employee by email": select(Employee).filter_by(email=EMAIL),
+    "login_user: user by name": select(User).filter_by(lead_name="Someone"),
+    "login_manager: leads by status": select(Query).filter_by(status="pending"),
+    "all_queries: leads by service": BY_SERVICE.order_by(LINKED_ID).limit(26),
+    "all_leads_add: user by phone": select(User).filter_by(phone=PHONE),
+    "all_leads_add: employee by phone": select(Employee).filter_by(phone=PHONE),
+    "employees_update: lead by phone": select(Query).filter_by(phone=PHONE),
+}
+
+# Cursor position in each grid sort, (sort value, id)
+GRID_CURSORS = {
+    "id": [1, 1],
+    "lead_name": ["Someone", 1],
+    "service": ["haircut", 1],
+    "status": ["pending", 1],
+}
+
+# Filters each grid sort is checked under: none, one status and one service
+GRID_FILTERS = [(None, None), ("status", "pending"), ("service", "haircut")]
+
+
+# Function to build the lead grid's page after a cursor, as lead_grid() builds
+# it, for every sort, order and GRID_FILTERS entry, {name: statement}
+def grid_pages():
+    pages = {}
+    for sort, order, (field, value) in product(SORTS, ["asc", "desc"], GRID_FILTERS):
+        filters = {"q": None, "status": None, "service": None, "sort": sort}
+        if field:
+            filters[field] = value
+        statement = select(Query)
+        if filters["status"]:
+            statement = statement.filter_by(status=filters["status"])
+        statement, sort_column, id_column = sorted_grid(statement, filters)
+        cursor = GRID_CURSORS[sort]
+        descending = order == "desc"
+        statement = seek(statement, sort_column, id_column, "after", cursor, descending)
+        name = f"all_queries: by {sort} {order}" + (f", one {field}" if field else "")
+        pages[name] = statement.limit(26)
+    return pages
+
+
+HOT_QUERIES.update(grid_pages())
+
+# Plan steps that read more rows than a page or lookup returns
+#   SCAN             walks a whole table or index
+#   LIST SUBQUERY    collects every row of an IN (SELECT ...) first
+#   USE TEMP B-TREE  sorts every matching row before the LIMIT applies
+# as do steps using an AUTOMATIC index, built for the one statement
+SLOW_STEPS = ("SCAN", "LIST SUBQUERY", "USE TEMP B-TREE")
+
+
+# Function to return the EXPLAIN QUERY PLAN detail lines for a statement
+def explain(statement):
+    sql = statement.compile(
+        dialect=db.engine.dialect, compile_kwargs={"literal_binds": True}
+    )
+    rows = db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    return [row[-1] for row in rows]
+
+
+# Function to return the steps of an EXPLAIN QUERY PLAN that are SLOW_STEPS
+def slow_steps(plan):
+    return [
+        detail
+        for detail in plan
+        if detail.startswith(SLOW_STEPS) or "AUTOMATIC" in detail
+    ]
+
+
+# Function to list hot queries whose plan scans, sorts or collects more rows
+# than they return, {name: plan}
+def full_scans():
+    failures = {}
+    for name, statement in HOT_QUERIES.items():
+        plan = explain(statement)
+        if slow_steps(plan):
+            failures[name] = plan
+    return failures
+
+
+@indexes_cli.command("check")
+def check_command():
+    """Fail if any hot query would scan, sort or collect a whole table."""
+    failures = full_scans()
+    for name, statement in HOT_QUERIES.items():
+        status = "SLOW" if name in failures else "ok"
+        click.echo(f"{status:4}  {name}")
+        for detail in failures.get(name, []):
+            click.echo(f"      {detail}")
+    if failures:
+        raise SystemExit(1)
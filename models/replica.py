@@ -0,0 +1,118 @@
+import functools
+import sqlite3
+import time
+
+import click
+from flask import current_app, g, has_app_context, request
+from flask.cli import AppGroup
+from flask_sqlalchemy.session import Session
+from sqlalchemy import Select, text
+from sqlalchemy.exc import OperationalError
+
+REPLICA = "replica"
+
+replica_cli = AppGroup("replica", help="Maintain the read-only replica.")
+
+
+# Session that sends plain SELECTs to the replica while a view asks for it
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and isinstance(clause, Select)
+            and not self._flushing
+            and has_app_context()
+            and g.get("use_replica")
+        ):
+            return g.replica_engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+# Function to return the replica engine, or None when none is configured
+def replica_engine():
+    from models.model import db
+
+    return db.engines.get(REPLICA)
+
+
+# Function to measure how far behind the primary the replica is, in seconds
+#
+# A refreshed copy records its refresh time in "replica_state". A replica
+# without that table (e.g. a mode=ro connection to the primary file) is live.
+def replica_lag(engine):
+    with engine.connect() as conn:
+        try:
+            refreshed_at = conn.execute(
+                text("SELECT refreshed_at FROM replica_state")
+            ).scalar()
+        except OperationalError:
+            return 0.0
+    return time.time() - (refreshed_at or 0)
+
+
+# Decorator: serve GET requests of a read-only view from a fresh enough replica
+def reads_from_replica(view):
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        engine = replica_engine()
+        if engine is None or request.method != "GET":
+            return view(*args, **kwargs)
+
+        max_lag = current_app.config.get("REPLICA_MAX_LAG", 30)
+        try:
+            fresh = replica_lag(engine) <= max_lag
+        except OperationalError:
+            fresh = False
+        if not fresh:
+            return view(*args, **kwargs)
+
+        from models.model import db
+
+        g.use_replica, g.replica_engine = True, engine
+        try:
+            return view(*args, **kwargs)
+        except OperationalError:
+            # Replica went away mid-request: answer from the primary instead
+            db.session.rollback()
+            g.use_replica = False
+            return view(*args, **kwargs)
+        finally:
+            g.use_replica = False
+
+    return wrapper
+
+
+# Function to copy the primary SQLite database into the replica file
+def refresh_replica():
+    from models.model import db
+
+    primary, replica = db.engines[None].url, replica_engine().url
+    if {primary.get_backend_name(), replica.get_backend_name()} != {"sqlite"}:
+        raise click.ClickException("refresh only copies SQLite databases")
+
+    source = sqlite3.connect(primary.database)
+    target = sqlite3.connect(replica.database.removeprefix("file:"))
+    try:
+        source.backup(target)
+        target.execute("CREATE TABLE IF NOT EXISTS replica_state (refreshed_at REAL)")
+        target.execute("DELETE FROM replica_state")
+        target.execute("INSERT INTO replica_state VALUES (?)", (time.time(),))
+        target.commit()
+    finally:
+        target.close()
+        source.close()
+
+
+@replica_cli.command("refresh")
+@click.option("--every", type=float, help="Keep refreshing every N seconds.")
+def refresh_command(every):
+    """Copy the primary database into the replica file."""
+    if replica_engine() is None:
+        raise click.ClickException("REPLICA_DATABASE_URL is not configured")
+    while True:
+        started = time.perf_counter()
+        refresh_replica()
+        click.echo(f"replica refreshed in {time.perf_counter() - started:.2f}s")
+        if not every:
+            break
+        time.sleep(every)
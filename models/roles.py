@@ -0,0 +1,77 @@
+import click
+from flask.cli import AppGroup
+from sqlalchemy import delete, exists, func, select
+
+from models.counters import TRACKED, apply_deltas
+from models.intake import INSERTS
+from models.model import Employee, User, db
+
+roles_cli = AppGroup("roles", help="Keep accounts in the table for their role.")
+
+# Copied as they are, timestamps included, so a moved account keeps its age
+COLUMNS = [
+    "lead_name",
+    "email",
+    "phone_number",
+    "phone",
+    "password",
+    "option",
+    "created_at",
+    "updated_at",
+]
+
+# (source model, target model, roles that belong in the target)
+MOVES = [
+    (User, Employee, ["admin", "manager"]),
+    (Employee, User, ["user"]),
+]
+
+
+# Function to move every "option" account from "source" to "target" in SQL
+#
+# Rows whose email or phone already exist in the target are left in place and
+# reported as skipped. Returns (moved, skipped).
+def move_role(source, target, option):
+    insert = INSERTS[db.engine.dialect.name]
+    rows = select(*[getattr(source, name) for name in COLUMNS]).where(
+        source.option == option
+    )
+    moved = db.session.execute(
+        insert(target.__table__).from_select(COLUMNS, rows).on_conflict_do_nothing()
+    ).rowcount
+    # Salted hashes are unique, so email + password identifies the copied row
+    copied = exists().where(
+        target.email == source.email, target.password == source.password
+    )
+    db.session.execute(
+        delete(source.__table__).where(source.option == option, copied)
+    )
+    skipped = db.session.execute(
+        select(func.count()).select_from(source).where(source.option == option)
+    ).scalar()
+
+    apply_deltas(
+        db.session.connection(),
+        {(TRACKED[source][0], option): -moved, (TRACKED[target][0], option): moved},
+    )
+    return moved, skipped
+
+
+# Function to run every move in a single transaction
+def migrate_roles():
+    report = []
+    for source, target, options in MOVES:
+        for option in options:
+            moved, skipped = move_role(source, target, option)
+            report.append(
+                (source.__tablename__, target.__tablename__, option, moved, skipped)
+            )
+    db.session.commit()
+    return report
+
+
+@roles_cli.command("migrate")
+def migrate_command():
+    """Move admins/managers to employees and users to users, set-based."""
+    for source, target, option, moved, skipped in migrate_roles():
+        click.echo(f"{option}: {moved} moved {source} -> {target}, {skipped} skipped")
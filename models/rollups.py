@@ -0,0 +1,213 @@
+from collections import Counter as Tally
+from datetime import date, timedelta
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import bindparam, func, literal, select
+
+from models.counters import read_counters
+from models.model import (
+    Counter,
+    DailyRollup,
+    Service,
+    StatusEvent,
+    db,
+    lead_services,
+    utcnow,
+)
+
+rollups_cli = AppGroup("rollups", help="Maintain the daily reporting rollups.")
+
+# Status events folded into the rollups per transaction
+BATCH_SIZE = 50000
+
+PERIODS = ["week", "month"]
+
+# Key of the high-water mark under the "rollup_marks" counter scope. The
+# status event log is append-only, so its ids make a safe mark; lead ids can
+# be reused once the newest lead is deleted.
+MARK = "lead_status_events"
+
+# Rollup dimensions, all read from the status events
+#   created  leads created per day
+#   service  leads created per day, per service they asked for
+#   status   moves into each status per day, new leads entering included
+DIMENSIONS = ["created", "service", "status"]
+
+
+# Function to build the grouped (day, key, count) SELECT of "dimension" over
+# the status events with id in (low, high]
+def dimension_counts(dimension, low, high):
+    day = func.date(StatusEvent.at)
+    events = [StatusEvent.id > low, StatusEvent.id <= high, StatusEvent.at.isnot(None)]
+    if dimension == "status":
+        return (
+            select(day, StatusEvent.to_status, func.count())
+            .where(*events)
+            .group_by(day, StatusEvent.to_status)
+        )
+    # The rest count creation events, the ones without a previous status
+    events.append(StatusEvent.from_status.is_(None))
+    if dimension == "service":
+        return (
+            select(day, Service.name, func.count())
+            .join(lead_services, lead_services.c.lead_id == StatusEvent.lead_id)
+            .join(Service, Service.id == lead_services.c.service_id)
+            .where(*events)
+            .group_by(day, Service.name)
+        )
+    return select(day, literal("all"), func.count()).where(*events).group_by(day)
+
+
+def _day(value):
+    # SQLite's date() returns text
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+# Function to move the high-water mark from "low" to "high"
+#
+# Fails with False if another refresh moved it first, so two refreshes can't
+# both count the same events.
+def _advance_mark(connection, low, high):
+    table = Counter.__table__
+    mark = (table.c.scope == "rollup_marks") & (table.c.key == MARK)
+    stored = connection.execute(select(table.c.value).where(mark)).first()
+    if stored is None and low == 0:
+        connection.execute(
+            table.insert().values(scope="rollup_marks", key=MARK, value=high)
+        )
+        return True
+    result = connection.execute(
+        table.update().where(mark, table.c.value == low).values(value=high)
+    )
+    return result.rowcount == 1
+
+
+# Function to add grouped (day, key, count) rows to the rollups of "dimension"
+#
+# The day rows already there are read in one SELECT, then updated and the
+# rest inserted as one executemany each.
+def _add_counts(connection, dimension, rows):
+    table = DailyRollup.__table__
+    counts = {(_day(day), key): count for day, key, count in rows}
+    if not counts:
+        return
+    days = [day for day, _ in counts]
+    existing = set(
+        connection.execute(
+            select(table.c.day, table.c.key).where(
+                table.c.dimension == dimension,
+                table.c.day.between(min(days), max(days)),
+            )
+        ).all()
+    )
+    updates = [
+        {"b_day": day, "b_key": key, "b_count": count}
+        for (day, key), count in counts.items()
+        if (day, key) in existing
+    ]
+    if updates:
+        connection.execute(
+            table.update()
+            .where(
+                table.c.day == bindparam("b_day"),
+                table.c.dimension == dimension,
+                table.c.key == bindparam("b_key"),
+            )
+            .values(count=table.c.count + bindparam("b_count")),
+            updates,
+        )
+    inserts = [
+        {"day": day, "dimension": dimension, "key": key, "count": count}
+        for (day, key), count in counts.items()
+        if (day, key) not in existing
+    ]
+    if inserts:
+        connection.execute(table.insert(), inserts)
+
+
+# Function to fold status events logged since the last refresh into the
+# rollups
+#
+# Only events above the mark are read, BATCH_SIZE at a time, each batch
+# adding to the existing day rows in its own transaction. Returns the number
+# of events covered.
+def refresh_rollups(batch_size=BATCH_SIZE):
+    low = read_counters("rollup_marks")["rollup_marks"].get(MARK, 0)
+    top = db.session.execute(select(func.max(StatusEvent.id))).scalar() or 0
+    start = low
+    while low < top:
+        high = min(low + batch_size, top)
+        connection = db.session.connection()
+        if not _advance_mark(connection, low, high):
+            db.session.rollback()
+            break
+        for dimension in DIMENSIONS:
+            rows = db.session.execute(dimension_counts(dimension, low, high))
+            _add_counts(connection, dimension, rows)
+        db.session.commit()
+        low = high
+    return low - start
+
+
+# Function to drop every rollup and the mark, then roll up the whole log
+def rebuild_rollups(batch_size=BATCH_SIZE):
+    db.session.execute(DailyRollup.__table__.delete())
+    db.session.execute(
+        Counter.__table__.delete().where(Counter.__table__.c.scope == "rollup_marks")
+    )
+    db.session.commit()
+    return refresh_rollups(batch_size)
+
+
+# Function to return the first day of the week or month holding "day"
+def period_start(day, period):
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+# Function to return the start of the period "periods - 1" before today's
+def first_period(period, periods, today=None):
+    start = period_start(today or utcnow().date(), period)
+    for _ in range(periods - 1):
+        start = period_start(start - timedelta(days=1), period)
+    return start
+
+
+# Function to sum the daily rollups of "dimension" into weeks or months
+#
+# Covers the last "periods" periods, newest first, as [{"period": start date,
+# "counts": {key: count}, "total": n}], read from the rollups only.
+def rollup_report(dimension, period="week", periods=12):
+    since = first_period(period, periods)
+    rows = db.session.execute(
+        select(DailyRollup.day, DailyRollup.key, DailyRollup.count).where(
+            DailyRollup.day >= since, DailyRollup.dimension == dimension
+        )
+    )
+    buckets = {}
+    for day, key, count in rows:
+        buckets.setdefault(period_start(day, period), Tally())[key] += count
+    return [
+        {
+            "period": start.isoformat(),
+            "counts": dict(buckets[start]),
+            "total": sum(buckets[start].values()),
+        }
+        for start in sorted(buckets, reverse=True)
+    ]
+
+
+@rollups_cli.command("refresh")
+@click.option("--batch-size", default=BATCH_SIZE, show_default=True)
+def refresh_command(batch_size):
+    """Fold new leads and status changes into the daily rollups."""
+    click.echo(f"Rolled up {refresh_rollups(batch_size)} new status events.")
+
+
+@rollups_cli.command("rebuild")
+@click.option("--batch-size", default=BATCH_SIZE, show_default=True)
+def rebuild_command(batch_size):
+    """Recompute the daily rollups from the whole event log."""
+    click.echo(f"Rolled up {rebuild_rollups(batch_size)} status events.")
@@ -0,0 +1,137 @@
+import re
+
+from flask import current_app
+from sqlalchemy import (
+    DDL,
+    Column,
+    Float,
+    Integer,
+    MetaData,
+    Table,
+    Text,
+    event,
+    func,
+    or_,
+    select,
+)
+
+from models.model import Query, db
+
+# Rank carried by cursors into the matches older than the ranked ones; FTS5
+# ranks are negative, so it can never be mistaken for a real one
+UNRANKED = 1.0
+
+# External-content FTS5 index over user_queries: it stores only the index, the
+# rows themselves are read from user_queries by rowid
+FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS user_queries_fts USING fts5(
+        lead_name, query,
+        content='user_queries', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS user_queries_fts_insert
+    AFTER INSERT ON user_queries BEGIN
+        INSERT INTO user_queries_fts(rowid, lead_name, query)
+        VALUES (new.id, new.lead_name, new.query);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS user_queries_fts_delete
+    AFTER DELETE ON user_queries BEGIN
+        INSERT INTO user_queries_fts(user_queries_fts, rowid, lead_name, query)
+        VALUES ('delete', old.id, old.lead_name, old.query);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS user_queries_fts_update
+    AFTER UPDATE OF lead_name, query ON user_queries BEGIN
+        INSERT INTO user_queries_fts(user_queries_fts, rowid, lead_name, query)
+        VALUES ('delete', old.id, old.lead_name, old.query);
+        INSERT INTO user_queries_fts(rowid, lead_name, query)
+        VALUES (new.id, new.lead_name, new.query);
+    END""",
+]
+
+# The FTS table is created by the DDL above, not by db.create_all()
+fts = Table(
+    "user_queries_fts",
+    MetaData(),
+    Column("rowid", Integer),
+    Column("user_queries_fts", Text),  # hidden column the MATCH applies to
+    Column("rank", Float),
+)
+
+# Keep the index alongside user_queries when tables are created by create_all()
+for statement in FTS_DDL:
+    event.listen(
+        Query.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    Query.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS user_queries_fts").execute_if(dialect="sqlite"),
+)
+
+
+# Function to turn free text into an FTS5 query: every word must match, the
+# last one as a prefix (search as you type), and FTS5 operators typed by the
+# user are treated as plain words
+def match_expression(text):
+    terms = [f'"{word}"' for word in re.findall(r"\w+", text or "")]
+    if terms:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+# Function to build the lowest rowid among the newest SEARCH_MAX_CANDIDATES
+# matches of "expression", or 0 when there are fewer matches than that
+def ranked_window_start(expression):
+    candidates = fts.alias("candidates")
+    oldest = (
+        select(candidates.c.rowid)
+        .where(candidates.c.user_queries_fts.match(expression))
+        .order_by(candidates.c.rowid.desc())
+        .limit(1)
+        .offset(current_app.config["SEARCH_MAX_CANDIDATES"] - 1)
+        .scalar_subquery()
+    )
+    return func.coalesce(oldest, 0)
+
+
+# Function to restrict "query" (over Query) to leads matching "text"
+#
+# Returns (query, rank) where rank orders best matches first, or None for
+# rank when the database has no FTS5 index and a LIKE scan is used instead.
+# Scoring every match of a very common word is what makes ranked search slow,
+# so only the newest SEARCH_MAX_CANDIDATES matches are ranked; older_matches()
+# reaches the rest.
+def search_leads(query, text):
+    if db.engine.dialect.name != "sqlite":
+        for word in re.findall(r"\w+", text or ""):
+            pattern = f"%{word}%"
+            query = query.filter(
+                or_(Query.lead_name.ilike(pattern), Query.query.ilike(pattern))
+            )
+        return query, None
+
+    expression = match_expression(text)
+    rank = fts.c.rank
+    query = (
+        query.add_columns(rank)
+        .join(fts, fts.c.rowid == Query.id)
+        .filter(
+            fts.c.user_queries_fts.match(expression),
+            fts.c.rowid >= ranked_window_start(expression),
+        )
+    )
+    return query, rank
+
+
+# Function to restrict "query" (over Query) to the FTS5 matches of "text" that
+# are older than the ranked ones of search_leads()
+#
+# Returns (query, rowid): they are unranked, and ordering or seeking on the
+# FTS5 rowid rather than Query.id lets the index walk them in id order.
+def older_matches(query, text):
+    expression = match_expression(text)
+    query = query.join(fts, fts.c.rowid == Query.id).filter(
+        fts.c.user_queries_fts.match(expression),
+        fts.c.rowid < ranked_window_start(expression),
+    )
+    return query, fts.c.rowid
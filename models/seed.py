@@ -0,0 +1,422 @@
+import random
+from collections import Counter as Tally
+from datetime import date, datetime, timedelta
+from itertools import accumulate, permutations
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import func, select, text
+from sqlalchemy.schema import CreateIndex, DropIndex
+
+from models.counters import apply_deltas, rebuild_counters
+from models.funnel import SCOPES as FUNNEL_SCOPES
+from models.leads import SERVICES, STATUSES
+from models.model import (
+    Counter,
+    Employee,
+    Query,
+    StatusEvent,
+    User,
+    db,
+    lead_services,
+)
+from models.passwords import hash_password
+from models.rollups import rebuild_rollups
+from models.search import FTS_DDL
+from models.services import service_ids
+
+# Rows per INSERT batch, each batch committed on its own
+BATCH_SIZE = 50000
+
+# Default share of leads per status, overridden with --statuses
+STATUS_WEIGHTS = {
+    "pending": 35,
+    "call_done": 20,
+    "waiting": 10,
+    "scheduled": 10,
+    "converted": 15,
+    "declined": 10,
+}
+
+FIRST_NAMES = (
+    "Aarav Aditi Akash Ananya Arjun Diya Ishaan Kavya Meera Neha Nikhil Pooja "
+    "Priya Rahul Riya Rohan Sanya Siddharth Sneha Tanvi Varun Vikram Zara Kabir"
+).split()
+LAST_NAMES = (
+    "Agarwal Bhat Chopra Das Desai Gupta Iyer Jain Kapoor Khan Kumar Malhotra "
+    "Mehta Menon Nair Patel Rao Reddy Saxena Shah Sharma Singh Verma Yadav"
+).split()
+QUERIES = [
+    "Do you have a {} slot this weekend?",
+    "What is the price for {}?",
+    "Please call me back about {}",
+    "Looking to book {} for a wedding",
+    "Is there any offer on {} this month?",
+    "Can I get {} done today evening?",
+]
+
+# Every ordered pick of one to three services, each weighed by how many
+# picks share its size so that one, two and three services are as likely
+SERVICE_PICKS = [pick for size in (1, 2, 3) for pick in permutations(SERVICES, size)]
+PICK_SIZES = Tally(len(pick) for pick in SERVICE_PICKS)
+PICK_WEIGHTS = list(accumulate(1 / PICK_SIZES[len(pick)] for pick in SERVICE_PICKS))
+
+# Time a lead stays pending before its status moves on, in seconds
+MIN_PENDING = 3600
+MAX_PENDING = 4 * 86400
+
+# Phones are 10-digit mobile numbers, 6000000000 to 9999999999. Row n gets
+# FIRST_PHONE + (n * PHONE_STRIDE + offset) % PHONE_RANGE; the stride shares
+# no factor with the range, so no two rows ever get the same number.
+FIRST_PHONE = 6000000000
+PHONE_RANGE = 4000000000
+PHONE_STRIDE = 2654435761
+
+ACCOUNT_COLUMNS = [
+    "lead_name",
+    "email",
+    "phone_number",
+    "phone",
+    "password",
+    "option",
+    "created_at",
+    "updated_at",
+]
+LEAD_COLUMNS = [
+    "id",
+    "lead_name",
+    "service",
+    "phone_number",
+    "phone",
+    "query",
+    "status",
+    "created_at",
+    "updated_at",
+]
+EVENT_COLUMNS = ["lead_id", "from_status", "to_status", "at"]
+LINK_COLUMNS = ["lead_id", "service_id"]
+
+# Dropped while leads load and replaced by one rebuild of the search index.
+# The secondary indexes of the tables leads load into are dropped and built
+# once at the end too, far cheaper than keeping them current row by row.
+FTS_INSERT_TRIGGER = "user_queries_fts_insert"
+
+
+# Function to parse a status distribution like "pending=40,converted=10"
+#
+# Statuses left out get no leads. Raises ValueError for an unknown status or
+# a weight that isn't a non-negative whole number.
+def parse_weights(value):
+    weights = {}
+    for part in value.split(","):
+        status, _, weight = part.partition("=")
+        status = status.strip()
+        if status not in STATUSES:
+            raise ValueError(f"unknown status: {status!r}")
+        if not weight.strip().isdigit():
+            raise ValueError(f"weight of {status} must be a whole number")
+        weights[status] = int(weight)
+    if not any(weights.values()):
+        raise ValueError("at least one status needs a weight above 0")
+    return weights
+
+
+class Generator:
+    def __init__(self, seed, days, until, weights):
+        self.rng = random.Random(seed)
+        self.offset = self.rng.randrange(PHONE_RANGE)
+        self.end = datetime.combine(until, datetime.min.time())
+        self.span = days * 86400
+        self.statuses = list(weights)
+        self.weights = list(accumulate(weights.values()))
+
+    # Function to return the phone of identity "n", unique across all tables
+    def phone(self, n):
+        return str(FIRST_PHONE + (n * PHONE_STRIDE + self.offset) % PHONE_RANGE)
+
+    def names(self, count):
+        first = self.rng.choices(FIRST_NAMES, k=count)
+        last = self.rng.choices(LAST_NAMES, k=count)
+        return [f"{a} {b}" for a, b in zip(first, last)]
+
+    # Function to return "count" creation times in the seeded span, oldest first
+    def times(self, count):
+        span, end = self.span, self.end
+        seconds = sorted(self.rng.random() * span for _ in range(count))
+        return [end - timedelta(seconds=span - offset) for offset in seconds]
+
+    # Function to return account rows in ACCOUNT_COLUMNS order, one per
+    # option, their phones numbered from identity "start"
+    def accounts(self, start, options, domain, password):
+        rows = []
+        names = self.names(len(options))
+        for i, (option, at) in enumerate(zip(options, self.times(len(options)))):
+            name = names[i]
+            phone = self.phone(start + i)
+            email = f"{name.replace(' ', '.').lower()}{i + 1}@{domain(option)}"
+            at = _stamp(at)
+            rows.append((name, email, int(phone), phone, password, option, at, at))
+        return rows
+
+    # Function to generate the leads with ids "first" + 1 onwards, one per
+    # creation time in "times"
+    #
+    # Leads i < len(owners) belong to user i, the others get their own phone
+    # numbered from identity "phones". Columns are drawn a batch at a time,
+    # far faster than per row. Returns (lead rows, event rows, service link
+    # rows, {status: leads moved there from pending}, seconds spent pending).
+    def leads(self, first, times, owners, phones, service_ids):
+        count = len(times)
+        names = self.names(count)
+        drawn = self.rng.choices(self.statuses, cum_weights=self.weights, k=count)
+        picks = self.rng.choices(SERVICE_PICKS, cum_weights=PICK_WEIGHTS, k=count)
+        texts = self.rng.choices(QUERIES, k=count)
+        random = self.rng.random
+        rows, events, links = [], [], []
+        seconds = 0
+        for n, created in enumerate(times):
+            i = first + n
+            if i < len(owners):
+                name, phone = owners[i][0], owners[i][3]
+            else:
+                name, phone = names[n], self.phone(phones + i)
+            status, asked = drawn[n], picks[n]
+            at = updated = _stamp(created)
+            events.append((i + 1, None, "pending", at))
+            if status != "pending":
+                gap = MIN_PENDING + int(random() * (MAX_PENDING - MIN_PENDING))
+                seconds += gap
+                updated = _stamp(created + timedelta(seconds=gap))
+                events.append((i + 1, "pending", status, updated))
+            rows.append(
+                (i + 1, name, ", ".join(asked), phone, phone)
+                + (texts[n].format(asked[0]), status, at, updated)
+            )
+            links += [(i + 1, service_ids[service]) for service in asked]
+        moved = Tally(drawn)
+        moved.pop("pending", None)
+        return rows, events, links, moved, seconds
+
+
+# Function to format a datetime the way SQLAlchemy stores DateTime in SQLite
+def _stamp(value):
+    return value.isoformat(" ", "microseconds")
+
+
+# Function to INSERT "rows", tuples in "columns" order, as one executemany
+# straight through the driver
+#
+# At millions of rows SQLAlchemy's per-row parameter processing costs more
+# than SQLite itself, so values must already be in their stored form.
+def _insert_rows(connection, table, columns, rows):
+    if rows:
+        marks = ", ".join("?" for _ in columns)
+        connection.exec_driver_sql(
+            f"INSERT INTO {table.name} ({', '.join(columns)}) VALUES ({marks})", rows
+        )
+
+
+def _insert_accounts(table, rows, batch_size):
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start : start + batch_size]
+        _insert_rows(db.session.connection(), table, ACCOUNT_COLUMNS, batch)
+        db.session.commit()
+
+
+# Function to check the tables seed_database() fills are still empty
+def _empty():
+    for model in (Employee, User, Query, StatusEvent):
+        if db.session.execute(select(func.count()).select_from(model)).scalar():
+            return False
+    return True
+
+
+def _fts_index(connection):
+    return connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE name = 'user_queries_fts'")
+    ).first()
+
+
+# Function to fill an empty database with "admins" admins, "managers"
+# managers, "users" users and "leads" leads, the same rows for the same seed
+# and "until" but for the password hash's salt
+#
+# Leads are created over the "days" days before "until", oldest first, with a
+# status drawn from "weights", their status events and service links. Every
+# account shares "password", hashed once. Rows go in as executemany INSERTs
+# of "batch_size" rows, then the counters, funnel and rollups are rebuilt.
+# Raises ValueError unless the database is empty. Returns
+# the number of rows added per table.
+def seed_database(
+    leads,
+    users,
+    admins=1,
+    managers=1,
+    seed=0,
+    weights=None,
+    password="password123",
+    days=180,
+    until=None,
+    batch_size=BATCH_SIZE,
+):
+    if not _empty():
+        raise ValueError("the database already has accounts, leads or events")
+    gen = Generator(seed, days, until or date.today(), weights or STATUS_WEIGHTS)
+    password = hash_password(password)
+    employees = gen.accounts(
+        0,
+        ["admin"] * admins + ["manager"] * managers,
+        lambda option: f"{option}.com",
+        password,
+    )
+    _insert_accounts(Employee.__table__, employees, batch_size)
+    owners = gen.accounts(
+        len(employees), ["user"] * users, lambda option: "gmail.com", password
+    )
+    _insert_accounts(User.__table__, owners, batch_size)
+    counts = {"employees": admins + managers, "users": users, "leads": leads}
+    counts.update(events=0, links=0)
+
+    connection = db.session.connection()
+    ids = service_ids(connection, SERVICES)
+    fts = connection.dialect.name == "sqlite" and _fts_index(connection)
+    if fts:
+        connection.execute(text(f"DROP TRIGGER IF EXISTS {FTS_INSERT_TRIGGER}"))
+    indexes = [
+        index
+        for table in (Query.__table__, StatusEvent.__table__, lead_services)
+        for index in table.indexes
+    ]
+    # By name: reflection skips expression indexes, so checkfirst can't see them
+    for index in indexes:
+        connection.execute(DropIndex(index, if_exists=True))
+    db.session.commit()
+
+    moved = Tally()
+    seconds = 0
+    times = gen.times(leads)
+    try:
+        for start in range(0, leads, batch_size):
+            rows, events, links, batch_moved, batch_seconds = gen.leads(
+                start,
+                times[start : start + batch_size],
+                owners,
+                len(employees) + len(owners),
+                ids,
+            )
+            connection = db.session.connection()
+            _insert_rows(connection, Query.__table__, LEAD_COLUMNS, rows)
+            _insert_rows(connection, StatusEvent.__table__, EVENT_COLUMNS, events)
+            _insert_rows(connection, lead_services, LINK_COLUMNS, links)
+            db.session.commit()
+            moved.update(batch_moved)
+            seconds += batch_seconds
+            counts["events"] += len(events)
+            counts["links"] += len(links)
+    finally:
+        db.session.rollback()
+        # The trigger first, committed on its own, and every step safe to
+        # repeat, so that a failed step still leaves new leads searchable and
+        # rerunning the steps finishes the rest
+        if fts:
+            db.session.connection().execute(text(FTS_DDL[1]))
+            db.session.commit()
+        connection = db.session.connection()
+        for index in indexes:
+            connection.execute(CreateIndex(index, if_not_exists=True))
+        if fts:
+            connection.execute(
+                text(
+                    "INSERT INTO user_queries_fts(user_queries_fts) "
+                    "VALUES ('rebuild')"
+                )
+            )
+        db.session.commit()
+
+    # The funnel counters follow from the draws, so the event log needn't be
+    # replayed
+    connection = db.session.connection()
+    table = Counter.__table__
+    connection.execute(table.delete().where(table.c.scope.in_(FUNNEL_SCOPES)))
+    apply_deltas(connection, _funnel_deltas(leads, moved, seconds))
+    db.session.commit()
+    rebuild_counters()
+    # One refresh batch covers the whole event log
+    rebuild_rollups(max(counts["events"], 1))
+    return counts
+
+
+# Function to build the funnel counters of "created" leads that started
+# pending, "moved" of them {status: leads} later moving once more, having
+# spent "seconds" pending in total: the counts fold() gives for their events
+def _funnel_deltas(created, moved, seconds):
+    deltas = Tally()
+    if created:
+        deltas[("funnel_reached", "pending")] = created
+        deltas[("funnel_entered", "pending")] = created
+    for status, count in moved.items():
+        deltas[("funnel_reached", status)] = count
+        deltas[("funnel_entered", status)] = count
+        deltas[("funnel_moves", f"pending>{status}")] = count
+    if moved:
+        deltas[("stage_exits", "pending")] = sum(moved.values())
+        deltas[("stage_seconds", "pending")] = seconds
+    return deltas
+
+
+def _weights_option(ctx, param, value):
+    try:
+        return parse_weights(value) if value else None
+    except ValueError as error:
+        raise click.BadParameter(str(error))
+
+
+@click.command("seed")
+@click.option("--leads", default=10000, show_default=True)
+@click.option("--users", default=1000, show_default=True)
+@click.option("--admins", default=2, show_default=True)
+@click.option("--managers", default=10, show_default=True)
+@click.option("--seed", "seed", default=0, show_default=True)
+@click.option(
+    "--statuses",
+    callback=_weights_option,
+    help="Status weights, e.g. pending=35,converted=15 (default: "
+    + ",".join(f"{status}={weight}" for status, weight in STATUS_WEIGHTS.items())
+    + ").",
+)
+@click.option("--password", default="password123", show_default=True)
+@click.option("--days", default=180, show_default=True, help="Days leads span.")
+@click.option(
+    "--until",
+    type=click.DateTime(["%Y-%m-%d"]),
+    help="Leads are created before this day (default: today).",
+)
+@click.option("--batch-size", default=BATCH_SIZE, show_default=True)
+@with_appcontext
+def seed_command(
+    leads, users, admins, managers, seed, statuses, password, days, until, batch_size
+):
+    """Fill an empty database with generated accounts and leads."""
+    # Missing tables are created as when the app starts
+    db.create_all()
+    try:
+        counts = seed_database(
+            leads,
+            users,
+            admins,
+            managers,
+            seed,
+            statuses,
+            password,
+            days,
+            until.date() if until else None,
+            batch_size,
+        )
+    except ValueError as error:
+        raise click.ClickException(str(error))
+    click.echo(
+        f"Seeded {counts['employees']} employees, {counts['users']} users and "
+        f"{counts['leads']} leads ({counts['events']} status events, "
+        f"{counts['links']} service links). Every account's password is "
+        f"{password!r}."
+    )
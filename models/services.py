@@ -0,0 +1,153 @@
+from collections import Counter as Tally
+
+from sqlalchemy import and_, event, exists, inspect, select
+from sqlalchemy.orm import Session
+
+from models.counters import SERVICE_SCOPE, apply_deltas, read_counters
+from models.model import Query, Service, lead_services
+
+# Leads per statement, below SQLite's bound-parameter limit
+CHUNK_SIZE = 900
+
+
+def _chunks(ids):
+    for start in range(0, len(ids), CHUNK_SIZE):
+        yield ids[start : start + CHUNK_SIZE]
+
+
+# Function to split a stored service string, e.g. "haircut, massage", into
+# distinct lowercase names in their original order
+def split_services(value):
+    names = (name.strip().lower() for name in (value or "").split(","))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+# Function to map service names to their ids, adding any not seen before
+def service_ids(connection, names):
+    table = Service.__table__
+    names = set(names)
+    if not names:
+        return {}
+    ids = dict(
+        connection.execute(
+            select(table.c.name, table.c.id).where(table.c.name.in_(names))
+        ).all()
+    )
+    missing = names - ids.keys()
+    if missing:
+        connection.execute(table.insert(), [{"name": name} for name in missing])
+        ids.update(
+            connection.execute(
+                select(table.c.name, table.c.id).where(table.c.name.in_(missing))
+            ).all()
+        )
+    return ids
+
+
+# Function to drop the service links of "lead_ids" and take them off the
+# per-service counters
+def unlink_services(connection, lead_ids):
+    dropped = Tally()
+    for chunk in _chunks(list(lead_ids)):
+        rows = connection.execute(
+            lead_services.delete()
+            .where(lead_services.c.lead_id.in_(chunk))
+            .returning(lead_services.c.service_id)
+        )
+        dropped.update(service_id for service_id, in rows)
+    if dropped:
+        table = Service.__table__
+        names = connection.execute(
+            select(table.c.id, table.c.name).where(table.c.id.in_(dropped))
+        )
+        apply_deltas(
+            connection,
+            {(SERVICE_SCOPE, name): -dropped[service_id] for service_id, name in names},
+        )
+
+
+# Function to link leads to their services, "services_by_lead" mapping a lead
+# id to its service string, in the caller's transaction
+#
+# With "replace" the leads' previous links are dropped first; new leads have
+# none. All links go in as one executemany INSERT, and the per-service
+# counters move with them.
+def link_services(connection, services_by_lead, replace=False):
+    if replace:
+        unlink_services(connection, services_by_lead)
+    names = {
+        lead_id: split_services(value) for lead_id, value in services_by_lead.items()
+    }
+    ids = service_ids(connection, {name for row in names.values() for name in row})
+    rows = [
+        {"lead_id": lead_id, "service_id": ids[name]}
+        for lead_id, row in names.items()
+        for name in row
+    ]
+    if rows:
+        connection.execute(lead_services.insert(), rows)
+        added = Tally(name for row in names.values() for name in row)
+        apply_deltas(
+            connection, {(SERVICE_SCOPE, name): count for name, count in added.items()}
+        )
+
+
+# Keep lead_services in step with every ORM flush, inside the same transaction
+@event.listens_for(Session, "after_flush")
+def _track_services(session, flush_context):
+    new = {}
+    changed = {}
+    deleted = []
+    for obj in session.new:
+        if isinstance(obj, Query):
+            new[obj.id] = obj.service
+    for obj in session.dirty:
+        if isinstance(obj, Query) and obj not in session.deleted:
+            if inspect(obj).attrs.service.history.has_changes():
+                changed[obj.id] = obj.service
+    for obj in session.deleted:
+        if isinstance(obj, Query):
+            deleted.append(obj.id)
+    if new or changed or deleted:
+        connection = session.connection()
+        unlink_services(connection, deleted)
+        link_services(connection, changed, replace=True)
+        link_services(connection, new)
+
+
+# Function to join "statement" (over Query) to the leads' links to service
+# "name"
+#
+# Returns (statement, lead id column). Ordered by that column, with cursor
+# bounds on it, a page seeks along (service_id, lead_id) in the association's
+# index instead of collecting every matching id first.
+def join_service(statement, name):
+    service_id = select(Service.id).where(Service.name == name).scalar_subquery()
+    statement = statement.join(
+        lead_services,
+        and_(
+            lead_services.c.lead_id == Query.id,
+            lead_services.c.service_id == service_id,
+        ),
+    )
+    return statement, lead_services.c.lead_id
+
+
+# Function to build a filter for leads linked to service "name"
+#
+# For pages ordered by another indexed column, e.g. lead_name: SQLite walks
+# that column's index and probes the association's primary key per lead,
+# where join_service() would collect and sort every linked lead first.
+def has_service(name):
+    service_id = select(Service.id).where(Service.name == name).scalar_subquery()
+    return exists().where(
+        lead_services.c.lead_id == Query.id,
+        lead_services.c.service_id == service_id,
+    )
+
+
+# Function to return leads per service, {name: count} by name, read from the
+# counters
+def service_counts():
+    counts = read_counters(SERVICE_SCOPE)[SERVICE_SCOPE]
+    return dict(sorted(counts.items()))
@@ -0,0 +1,53 @@
+import threading
+from collections import Counter as Tally
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from models.model import Employee, Query, User
+
+# Tables whose committed writes bump a data version
+WATCHED = {model.__tablename__ for model in (User, Employee, Query)}
+
+_versions = Tally()
+_lock = threading.Lock()
+
+
+# Function to read the current data version of each table, as a tuple
+def data_version(*tables):
+    return tuple(_versions[table] for table in tables)
+
+
+def _changed(session):
+    return session.info.setdefault("changed_tables", set())
+
+
+# Remember which watched tables an ORM flush wrote to
+@event.listens_for(Session, "after_flush")
+def _track_flush(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table in WATCHED:
+            _changed(session).add(table)
+
+
+# Remember which watched tables a Core INSERT/UPDATE/DELETE wrote to
+@event.listens_for(Session, "do_orm_execute")
+def _track_execute(state):
+    if state.is_insert or state.is_update or state.is_delete:
+        table = getattr(state.statement.table, "name", None)
+        if table in WATCHED:
+            _changed(state.session).add(table)
+
+
+# Bump versions only once the writes are visible to other sessions. Tables
+# written in a rolled back transaction are bumped by the next commit, which
+# only costs a cache miss.
+@event.listens_for(Session, "after_commit")
+def _bump_versions(session):
+    tables = session.info.pop("changed_tables", None)
+    if tables:
+        with _lock:
+            for table in tables:
+                _versions[table] += 1
+
@@ -0,0 +1,38 @@
+import pytest
+
+from app import create_app
+from models.model import Query, db
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app(
+        {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}",
+            "TEMPLATE_CACHE_DIR": str(tmp_path / "jinja_cache"),
+            "TEMPLATE_WARMUP": False,
+        }
+    )
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+# Function to add leads, one per (lead_name, service, query) tuple, with
+# distinct phone numbers
+@pytest.fixture
+def add_leads(app):
+    count = [0]
+
+    def add(rows):
+        leads = []
+        for lead_name, service, text in rows:
+            count[0] += 1
+            leads.append(Query(lead_name, service, f"98{count[0]:08d}", text))
+        db.session.add_all(leads)
+        db.session.commit()
+        return leads
+
+    return add
@@ -0,0 +1,16 @@
+from models.model import Query, db
+
+
+def test_legacy_phone_is_asked_to_be_fixed(app):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session.update(user_option="user", lead_name="Asha", phone_number="12345")
+
+    response = client.post(
+        "/login/user/contact_us", data={"service": "haircut", "query": "price"}
+    )
+    assert response.status_code == 302
+    assert db.session.query(Query).count() == 0
+    with client.session_transaction() as session:
+        ((category, message),) = session["_flashes"]
+    assert category == "error" and "phone number" in message
@@ -0,0 +1,64 @@
+from collections import Counter as Tally
+
+from models.counters import SERVICE_SCOPE, read_counters, rebuild_counters
+from models.lead_bulk import delete_many, update_statuses
+from models.model import Query, db
+from models.services import service_counts, split_services
+
+
+# Function to count leads per status and per service from the leads themselves
+def recount():
+    leads = db.session.query(Query).all()
+    statuses = Tally(lead.status or "" for lead in leads)
+    services = Tally(name for lead in leads for name in split_services(lead.service))
+    return dict(statuses), dict(services)
+
+
+def nonzero(counts):
+    return {key: value for key, value in counts.items() if value}
+
+
+def assert_counters_match():
+    statuses, services = recount()
+    counts = read_counters("user_queries", SERVICE_SCOPE)
+    assert nonzero(counts["user_queries"]) == statuses
+    assert nonzero(counts[SERVICE_SCOPE]) == services
+    assert nonzero(service_counts()) == services
+
+
+def test_counters_follow_orm_changes(add_leads):
+    leads = add_leads(
+        [
+            ("Asha", "haircut", "price"),
+            ("Bela", "haircut, massage", "price"),
+            ("Chitra", "waxing", "price"),
+        ]
+    )
+    assert_counters_match()
+
+    leads[0].status = "call_done"
+    leads[1].service = "massage, styling"
+    db.session.delete(leads[2])
+    db.session.commit()
+    assert_counters_match()
+
+
+def test_counters_follow_bulk_changes(add_leads):
+    leads = add_leads([(f"Lead {n}", "haircut, tanning", "price") for n in range(6)])
+    ids = [lead.id for lead in leads]
+
+    assert update_statuses(ids[:4], "scheduled") == 4
+    assert update_statuses(ids[:4], "scheduled") == 0
+    assert delete_many(ids[3:]) == 3
+    assert_counters_match()
+
+
+def test_rebuild_fixes_drift(add_leads):
+    add_leads([("Asha", "haircut", "price"), ("Bela", "massage", "price")])
+    db.session.execute(db.text("UPDATE dashboard_counters SET value = value + 5"))
+    db.session.commit()
+
+    totals = rebuild_counters()
+    assert totals["user_queries"] == 2
+    assert totals[SERVICE_SCOPE] == 2
+    assert_counters_match()
@@ -0,0 +1,4 @@
+def test_missing_page_is_a_404_that_is_not_cached(app):
+    response = app.test_client().get("/no-such-page")
+    assert response.status_code == 404
+    assert "public" not in response.headers.get("Cache-Control", "")
@@ -0,0 +1,44 @@
+import pytest
+
+from models.funnel import funnel_report, rebuild_funnel
+from models.lead_bulk import update_statuses
+from models.model import db
+
+
+@pytest.fixture
+def moved(add_leads):
+    leads = add_leads([(f"Lead {n}", "haircut", "price") for n in range(4)])
+    for lead in leads[:3]:
+        lead.status = "call_done"
+    db.session.commit()
+    update_statuses([lead.id for lead in leads[:2]], "scheduled")
+    leads[0].status = "converted"
+    leads[2].status = "declined"
+    db.session.commit()
+    return leads
+
+
+def test_funnel_counts_each_stage(moved):
+    report = funnel_report()
+    assert [(stage["status"], stage["reached"]) for stage in report["funnel"]] == [
+        ("pending", 4),
+        ("call_done", 3),
+        ("scheduled", 2),
+        ("converted", 1),
+    ]
+    assert [stage["rate"] for stage in report["funnel"]] == [None, 0.75, 0.6667, 0.5]
+    assert report["moves"] == {
+        "pending>call_done": 3,
+        "call_done>scheduled": 2,
+        "call_done>declined": 1,
+        "scheduled>converted": 1,
+    }
+    stages = {stage["status"]: stage for stage in report["stages"]}
+    assert stages["call_done"]["timed_exits"] == 3
+    assert stages["declined"]["reached"] == 1
+
+
+def test_rebuild_replays_the_event_log(moved):
+    report = funnel_report()
+    assert rebuild_funnel() == 4 + 3 + 2 + 2
+    assert funnel_report() == report
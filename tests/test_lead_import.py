@@ -0,0 +1,23 @@
+from models.lead_import import import_leads
+from models.model import Query, db
+
+
+def rows(phones):
+    for line_num, phone in enumerate(phones, start=1):
+        row = {"lead_name": "Asha", "service": "haircut", "query": "price"}
+        yield line_num, {**row, "phone_number": phone}
+
+
+def test_duplicates_are_rejected_within_and_across_batches(app):
+    phones = ["9876543210", "9876543211", "9876543210", "9876543212", "9876543211"]
+    rejects = []
+    stats = import_leads(
+        rows(phones), batch_size=3, on_reject=lambda *reject: rejects.append(reject)
+    )
+
+    assert stats == {"read": 5, "imported": 3, "invalid": 0, "duplicates": 2}
+    assert rejects == [
+        (3, "phone_number repeated in file"),
+        (5, "phone_number already exists"),
+    ]
+    assert db.session.query(Query).count() == 3
@@ -0,0 +1,30 @@
+import pytest
+from werkzeug.security import generate_password_hash
+
+from models.passwords import hash_password, needs_rehash, verify_and_upgrade
+
+
+class Account:
+    def __init__(self, password):
+        self.password = password
+
+
+@pytest.mark.parametrize(
+    "method", ["scrypt", "scrypt:32768:8:1", "pbkdf2:sha256", "pbkdf2:sha256:1000"]
+)
+def test_hash_made_with_the_configured_method_is_kept(app, method):
+    app.config["PASSWORD_HASH_METHOD"] = method
+    assert not needs_rehash(hash_password("secret"))
+
+
+def test_hash_made_with_another_method_is_upgraded(app):
+    app.config["PASSWORD_HASH_METHOD"] = "scrypt"
+    account = Account(generate_password_hash("secret", "pbkdf2:sha256:1000"))
+    assert verify_and_upgrade(account, "secret")
+    assert account.password.startswith("scrypt:32768:8:1$")
+
+
+def test_plain_legacy_value_is_upgraded(app):
+    account = Account("secret")
+    assert verify_and_upgrade(account, "secret")
+    assert not needs_rehash(account.password)
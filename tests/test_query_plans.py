@@ -0,0 +1,33 @@
+from sqlalchemy import select
+
+from models.model import Query, lead_services
+from models.query_plans import HOT_QUERIES, explain, full_scans, slow_steps
+
+
+def test_hot_queries_use_indexes(app):
+    assert full_scans() == {}
+
+
+def test_grid_sorts_are_hot_queries(app):
+    names = [name for name in HOT_QUERIES if name.startswith("all_queries: by ")]
+    assert len(names) == 4 * 2 * 3
+
+
+def test_table_scan_is_slow(app):
+    plan = explain(select(Query).filter_by(query="price"))
+    assert slow_steps(plan)
+
+
+def test_in_subquery_is_slow(app):
+    linked = select(lead_services.c.lead_id).where(lead_services.c.service_id == 1)
+    plan = explain(
+        select(Query).where(Query.id.in_(linked)).order_by(Query.id).limit(26)
+    )
+    assert any(step.startswith("LIST SUBQUERY") for step in slow_steps(plan))
+
+
+def test_sort_without_index_is_slow(app):
+    plan = explain(
+        select(Query).filter_by(status="pending").order_by(Query.query).limit(26)
+    )
+    assert any(step.startswith("USE TEMP B-TREE") for step in slow_steps(plan))
@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from models.model import Employee, User, db
+from models.roles import migrate_roles
+
+JOINED = datetime(2024, 3, 1, 9, 30)
+
+
+def test_moved_accounts_keep_their_timestamps(app):
+    manager = User("Meera", "meera@gmail.com", "9876543210", "secret")
+    manager.option = "manager"
+    user = User("Ravi", "ravi@gmail.com", "9876543211", "secret")
+    db.session.add_all([manager, user])
+    db.session.commit()
+    db.session.execute(db.update(User).values(created_at=JOINED, updated_at=JOINED))
+    db.session.commit()
+
+    assert ("users", "employees", "manager", 1, 0) in migrate_roles()
+    moved = db.session.query(Employee).filter_by(email="meera@gmail.com").one()
+    assert (moved.created_at, moved.updated_at) == (JOINED, JOINED)
+    assert db.session.query(User).filter_by(email="meera@gmail.com").count() == 0
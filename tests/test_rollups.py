@@ -0,0 +1,38 @@
+from models.model import db
+from models.rollups import rebuild_rollups, refresh_rollups, rollup_report
+
+
+def test_refresh_folds_new_events_once(add_leads):
+    leads = add_leads(
+        [
+            ("Asha", "haircut", "price"),
+            ("Bela", "haircut, massage", "price"),
+            ("Chitra", "waxing", "price"),
+        ]
+    )
+    assert refresh_rollups() == 3
+    leads[0].status = "call_done"
+    leads[1].status = "call_done"
+    db.session.commit()
+    assert refresh_rollups() == 2
+    assert refresh_rollups() == 0
+
+    (created,) = rollup_report("created")
+    assert created["counts"] == {"all": 3}
+    (service,) = rollup_report("service")
+    assert service["counts"] == {"haircut": 2, "massage": 1, "waxing": 1}
+    (status,) = rollup_report("status", period="month")
+    assert status["counts"] == {"pending": 3, "call_done": 2}
+
+
+def test_rebuild_matches_refreshes(add_leads):
+    leads = add_leads([(f"Lead {n}", "styling", "price") for n in range(5)])
+    refresh_rollups(batch_size=2)
+    leads[0].status = "declined"
+    db.session.commit()
+    refresh_rollups(batch_size=2)
+    created, status = rollup_report("created"), rollup_report("status")
+
+    assert rebuild_rollups() == 6
+    assert rollup_report("created") == created
+    assert rollup_report("status") == status
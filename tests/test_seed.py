@@ -0,0 +1,38 @@
+from models.counters import read_counters, rebuild_counters
+from models.model import Query, StatusEvent, db, lead_services
+from models.seed import seed_database
+
+FTS_TRIGGERS = {
+    "user_queries_fts_insert",
+    "user_queries_fts_update",
+    "user_queries_fts_delete",
+}
+
+
+def schema_names(kind):
+    rows = db.session.execute(
+        db.text("SELECT name FROM sqlite_master WHERE type = :kind"), {"kind": kind}
+    )
+    return {name for name, in rows}
+
+
+def nonzero(counts):
+    return {
+        scope: {key: value for key, value in keys.items() if value}
+        for scope, keys in counts.items()
+    }
+
+
+def test_seed_restores_indexes_and_triggers(app):
+    counts = seed_database(50, 5, days=30)
+    assert counts["leads"] == 50
+    assert db.session.query(Query).count() == 50
+
+    tables = (Query.__table__, StatusEvent.__table__, lead_services)
+    indexes = {index.name for table in tables for index in table.indexes}
+    assert indexes <= schema_names("index")
+    assert FTS_TRIGGERS <= schema_names("trigger")
+
+    seeded = nonzero(read_counters())
+    rebuild_counters()
+    assert nonzero(read_counters()) == seeded
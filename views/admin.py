@@ -0,0 +1,411 @@
+from flask import Blueprint, flash, redirect, render_template, request, session, url_for
+
+from models.counters import read_counters
+from models.intake import email_in, insert_unique, phone_in
+from models.model import Employee, Query, User, db
+from models.pagination import LazyPage, keyset_paginate, page_size
+from models.passwords import hash_password
+from models.phones import canonical_phone
+from models.replica import reads_from_replica
+
+admin_page = Blueprint("admin", __name__)
+
+
+# Function to save employee data to database
+def save_employee(lead_name, email, phone_number, password):
+    if Employee.query.filter_by(email=email).first():
+        flash("Email already exists.", "error")
+        return False
+
+    employee = Employee(
+        lead_name=lead_name,
+        email=email,
+        phone_number=phone_number,
+        password=password,
+        option="employee",
+    )
+    db.session.add(employee)
+    db.session.commit()
+    return True
+
+
+# Route for admin login
+@admin_page.route("/login/admin", methods=["GET"])
+def admin_login():
+    if session.get("user_option") == "admin":
+        lead_name = session.get("lead_name")
+        phone_number = session.get("phone_number")
+        counts = read_counters("users", "employees")
+        total_users_registered = counts["users"].get("user", 0)
+        total_employees = sum(counts["employees"].values())
+
+        return render_template(
+            "/admin/admin.html",
+            lead_name=lead_name,
+            phone_number=phone_number,
+            total_users_registered=total_users_registered,
+            total_employees=total_employees,
+        )
+    return redirect(url_for("public.home"))
+
+
+# Route for admin's employee dashboard page
+@admin_page.route("/login/admin/employee", methods=["GET"])
+@reads_from_replica
+def employees_display():
+    if session.get("user_option") == "admin":
+        lead_name = session.get("lead_name")
+        phone_number = session.get("phone_number")
+
+        page = request.args.get("page", 1, type=int)
+        after = request.args.get("after", type=int)
+        before = request.args.get("before", type=int)
+        per_page = page_size()
+
+        # Fetched by the template only when its cached fragment is stale
+        employees = LazyPage(
+            keyset_paginate,
+            Employee,
+            page=page,
+            per_page=per_page,
+            after=after,
+            before=before,
+        )
+
+        return render_template(
+            "/admin/admin_employee_page.html",
+            lead_name=lead_name,
+            phone_number=phone_number,
+            employees=employees,
+            page=page,
+            per_page=per_page,
+        )
+    return redirect(url_for("public.home"))
+
+
+# Route for admin's user dashboard page
+@admin_page.route("/login/admin/users", methods=["GET"])
+@reads_from_replica
+def users_display():
+    if session.get("user_option") == "admin":
+        lead_name = session.get("lead_name")
+        phone_number = session.get("phone_number")
+
+        page_2 = request.args.get("page_2", 1, type=int)
+        after = request.args.get("after", type=int)
+        before = request.args.get("before", type=int)
+        per_page_2 = page_size()
+
+        # Fetched by the template only when its cached fragment is stale
+        users = LazyPage(
+            keyset_paginate,
+            User,
+            page=page_2,
+            per_page=per_page_2,
+            after=after,
+            before=before,
+        )
+
+        return render_template(
+            "/admin/admin_user_page.html",
+            lead_name=lead_name,
+            phone_number=phone_number,
+            page_2=page_2,
+            per_page_2=per_page_2,
+            users=users,
+        )
+    # return redirect(url_for("public.home"))
+    return redirect(url_for("public.home"))
+
+
+# Route to display flashed message
+@admin_page.route("/admin/all_employees")
+def flash_message():
+    if session.get("user_option") == "admin":
+        lead_name = session.get("lead_name")
+        phone_number = session.get("phone_number")
+        return render_template(
+            "/admin/all_employees.html", lead_name=lead_name, phone_number=phone_number
+        )
+    return redirect(url_for("public.home"))
+
+
+# Route for admin's add page
+@admin_page.route("/admin/add", methods=["GET", "POST"])
+def add_new_user():
+    if session.get("user_option") == "admin":
+        lead_name = session.get("lead_name")
+        phone_number = session.get("phone_number")
+        if request.method == "POST":
+            lead_name = request.form.get("lead_name")
+            email = request.form.get("email")
+            phone_number = request.form.get("phone_number")
+            password = request.form.get("password")
+            option = request.form.get("option")
+
+            if not lead_name or not email or not password:
+                flash("Enter all details to proceed.")
+                return render_template("/admin/admin_add.html")
+
+            if not len(lead_name) < 28:
+                flash("Not more than 28 characters are allowed!", "error")
+                return redirect(url_for("admin.flash_message"))
+
+            phone_number = canonical_phone(phone_number)
+            if phone_number is None:
+                flash("Please enter a valid 10-digit phone number")
+                return redirect(url_for("admin.flash_message"))
+
+            if option == "user" and not email.endswith("@gmail.com"):
+                flash("Enter correct mail to proceed.")
+                return render_template("/admin/admin_add.html")
+
+            if option == "admin" and not email.endswith("@admin.com"):
+                flash("Enter correct mail to proceed.")
+                return render_template("/admin/admin_add.html")
+
+            if option == "manager" and not email.endswith("@manager.com"):
+                flash("Enter correct mail to proceed.")
+                return render_template("/admin/admin_add.html")
+
+            values = {
+                "lead_name": lead_name,
+                "email": email,
+                "phone_number": phone_number,
+                "phone": phone_number,
+                "password": hash_password(password),
+            }
+            try:
+                if option == "user":
+                    _, collided = insert_unique(User, values)
+                    if collided:
+                        flash("Email or phone number already exists!", "error")
+                        return redirect(url_for("admin.flash_message"))
+                    flash("User added successfully.")
+                else:
+                    values["option"] = option
+                    _, collided = insert_unique(
+                        Employee,
+                        values,
+                        guards={
+                            "email": email_in(User, email),
+                            "phone_number": phone_in(User, phone_number)
+                            | phone_in(Query, phone_number),
+                        },
+                    )
+                    if collided:
+                        flash("User with this email or phone number already exists.")
+                        return render_template("/admin/admin_add.html")
+                    flash("Employee added successfully.")
+                db.session.commit()
+                return redirect(url_for("admin.flash_message"))
+            except Exception as e:
+                db.session.rollback()
+                flash(f"An error occurred: {str(e)}")
+                return render_template("/admin/admin_add.html")
+
+    return render_template("/admin/admin_add.html")
+
+
+# Route for admin's update page
+@admin_page.route("/admin/update", methods=["GET", "POST"])
+def update_an_employee():
+    if session.get("user_option") == "admin":
+        lead_name = session.get("lead_name")
+        phone_number = session.get("phone_number")
+        if request.method == "POST":
+            id = request.form.get("id")
+            phone_number = request.form.get("phone_number")
+            email = request.form.get("email")
+            lead_name = request.form.get("lead_name")
+            option = request.form.get("option")
+
+            if not email and not lead_name and not option and not phone_number:
+                flash("Enter at least one field to proceed further.", "error")
+                return render_template("/admin/all_employees.html")
+
+            if not len(lead_name) < 28:
+                flash("Not more than 28 characters are allowed!", "error")
+                return redirect(url_for("admin.flash_message"))
+
+            if option == "admin" and not email.endswith("@admin.com"):
+                flash("Enter correct email.", "error")
+                return redirect(url_for("admin.flash_message"))
+
+            if option == "manager" and not email.endswith("@manager.com"):
+                flash("Enter correct email.", "error")
+                return redirect(url_for("admin.flash_message"))
+
+            if option == "admin" and not email.endswith("@admin.com"):
+                flash("Enter correct email.", "error")
+                return redirect(url_for("admin.flash_message"))
+
+            if option == "user" and not email.endswith("@gmail.com"):
+                flash("Enter correct email.", "error")
+                return redirect(url_for("admin.flash_message"))
+
+            phone_number = canonical_phone(phone_number)
+            if phone_number is None:
+                flash("Please enter a valid 10-digit phone number")
+                return redirect(url_for("admin.flash_message"))
+
+            queries = db.session.query(Query).filter_by(phone=phone_number).first()
+
+            if queries:
+                flash("Phone number already exists!", "error")
+                return redirect(url_for("admin.flash_message"))
+
+            employee = db.session.query(Employee).filter_by(id=id).first()
+
+            if employee:
+                if id:
+                    employee.id = id
+                if email:
+                    employee.email = email
+                if lead_name:
+                    employee.lead_name = lead_name
+                if phone_number:
+                    employee.phone_number = phone_number
+                if option:
+                    employee.option = option
+
+                db.session.commit()
+                flash("Employee updated successfully.", "success")
+                return redirect(url_for("admin.flash_message"))
+            else:
+                if id == "":
+                    flash("Please enter the employee's ID.", "error")
+                    return redirect(url_for("admin.flash_message"))
+                else:
+                    flash("No employee found with the provided ID.", "error")
+                    return redirect(url_for("admin.flash_message"))
+        id = request.args.get("id")
+        if id:
+            employee = db.session.query(Employee).filter_by(id=id).first()
+            if employee:
+                return render_template("/admin/admin_employee_page.html")
+            else:
+                flash("No employee found with the provided ID.", "error")
+                return render_template("/admin/admin_employee_page.html")
+    return redirect(url_for("public.home"))
+
+
+# Route for updating user
+@admin_page.route("/admin/update/user", methods=["GET", "POST"])
+def update_an_user():
+    if session.get("user_option") == "admin":
+        if request.method == "POST":
+            id = request.form.get("id")
+            phone_number = request.form.get("phone_number")
+            email = request.form.get("email")
+            lead_name = request.form.get("lead_name")
+            option = request.form.get("option")
+
+            if not email and not lead_name and not option and not phone_number:
+                flash("Enter at least one field to proceed further.", "error")
+                return redirect(url_for("admin.update_an_user"))
+
+            if not len(lead_name) < 28:
+                flash("Not more than 28 characters are allowed!", "error")
+                return redirect(url_for("admin.flash_message"))
+
+            if option == "admin" and not email.endswith("@admin.com"):
+                flash("Enter correct email.", "error")
+                return redirect(url_for("admin.flash_message"))
+
+            if option == "manager" and not email.endswith("@manager.com"):
+                flash("Enter correct email.", "error")
+                return redirect(url_for("admin.flash_message"))
+
+            phone_number = canonical_phone(phone_number)
+            if phone_number is None:
+                flash("Please enter a valid 10-digit phone number")
+                return redirect(url_for("admin.flash_message"))
+
+            queries = db.session.query(Query).filter_by(phone=phone_number).first()
+
+            if queries:
+                flash("Phone number already exists!", "error")
+                return redirect(url_for("admin.flash_message"))
+
+            employee = db.session.query(Employee).filter_by(phone=phone_number).first()
+            if employee:
+                flash("Phone number already exists!", "error")
+                return redirect(url_for("admin.flash_message"))
+
+            employee_mail = db.session.query(Employee).filter_by(email=email).first()
+            if employee_mail and employee_mail.email == email:
+                flash("Email already exists!", "error")
+                return redirect(url_for("admin.flash_message"))
+
+            user = db.session.query(User).filter_by(id=id).first()
+
+            if user:
+                if email:
+                    user.email = email
+                if lead_name:
+                    user.lead_name = lead_name
+                if phone_number:
+                    user.phone_number = phone_number
+                if option:
+                    user.option = option
+
+                db.session.commit()
+                flash("User updated successfully.", "success")
+                return redirect(url_for("admin.flash_message"))
+            else:
+                flash("No user found with the provided ID.", "error")
+                return redirect(url_for("admin.flash_message"))
+
+        id = request.args.get("id")
+        if id:
+            user = db.session.query(User).filter_by(id=id).first()
+            if user:
+                return render_template("simple_page.update_user.html", user=user)
+            else:
+                flash("No user found with the provided ID.", "error")
+                return redirect(url_for("admin.flash_message"))
+
+        return render_template("/admin/admin.html")
+    return redirect(url_for("public.home"))
+
+
+# Function for deleting employee
+@admin_page.route("/admin/delete", methods=["GET"])
+def delete_an_employee():
+    if session.get("user_option") == "admin":
+        admin_email = session.get("email")
+
+        id = request.args.get("id")
+        employee = Employee.query.get(id)
+
+        if employee:
+            if admin_email == employee.email:
+                flash("You cannot delete yourself!", "error")
+            else:
+                db.session.delete(employee)
+                db.session.commit()
+                flash("Employee deleted successfully.", "success")
+        else:
+            flash("Employee not found.", "error")
+
+        return redirect(url_for("admin.flash_message"))
+
+    return redirect(url_for("public.home"))
+
+
+# Function for deleting user
+@admin_page.route("/admin/delete/user", methods=["GET"])
+def delete_an_user():
+    if session.get("user_option") == "admin":
+        id = request.args.get("id")
+        user = db.session.query(User).filter_by(id=id).first()
+        if user:
+            db.session.delete(user)
+            db.session.commit()
+            flash("User deleted successfully.", "success")
+        else:
+            flash("User not found.", "error")
+
+        return redirect(url_for("admin.flash_message"))
+    return redirect(url_for("public.home"))
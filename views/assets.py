@@ -0,0 +1,136 @@
+import gzip
+import hashlib
+import io
+import json
+import mimetypes
+import os
+
+import click
+from flask import current_app, request, send_from_directory
+from flask.cli import AppGroup
+
+try:
+    import brotli
+except ImportError:  # optional: only gzip variants are built without it
+    brotli = None
+
+try:
+    from PIL import Image
+except ImportError:  # optional: images are not converted to WebP without it
+    Image = None
+
+assets_cli = AppGroup("assets", help="Build fingerprinted static assets.")
+
+BUILD_DIR = "build"
+MANIFEST = "manifest.json"
+TEXT_TYPES = {".css", ".js", ".svg", ".json", ".txt", ".html"}
+IMAGE_TYPES = {".png", ".jpg", ".jpeg"}
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+# Function to fingerprint, precompress and convert every file under static/
+def build_assets(static_folder):
+    build_root = os.path.join(static_folder, BUILD_DIR)
+    manifest = {}
+    for directory, dirs, files in os.walk(static_folder):
+        if os.path.abspath(directory).startswith(os.path.abspath(build_root)):
+            continue
+        for filename in files:
+            source = os.path.join(directory, filename)
+            name = os.path.relpath(source, static_folder).replace(os.sep, "/")
+            with open(source, "rb") as f:
+                data = f.read()
+
+            stem, ext = os.path.splitext(name)
+            digest = hashlib.sha256(data).hexdigest()[:12]
+            built = f"{BUILD_DIR}/{stem}.{digest}{ext}"
+            target = os.path.join(static_folder, built)
+            manifest[name] = built
+            if os.path.exists(target):
+                continue
+            _write(target, data)
+
+            if ext.lower() in TEXT_TYPES:
+                _write(target + ".gz", gzip.compress(data, compresslevel=9, mtime=0))
+                if brotli is not None:
+                    _write(target + ".br", brotli.compress(data))
+            elif ext.lower() in IMAGE_TYPES and Image is not None:
+                buffer = io.BytesIO()
+                Image.open(io.BytesIO(data)).save(buffer, "WEBP", quality=80)
+                if buffer.tell() < len(data):
+                    _write(target + ".webp", buffer.getvalue())
+
+    _write(
+        os.path.join(build_root, MANIFEST),
+        json.dumps(manifest, indent=2, sort_keys=True).encode(),
+    )
+    return manifest
+
+
+# Function to load the asset manifest written by build_assets()
+def load_manifest(static_folder):
+    try:
+        with open(os.path.join(static_folder, BUILD_DIR, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+# Function to serve a static file, preferring WebP/brotli/gzip variants
+def serve_static(filename):
+    folder = current_app.static_folder
+    response = None
+
+    if os.path.isfile(os.path.join(folder, filename + ".webp")):
+        if "image/webp" in request.accept_mimetypes:
+            response = send_from_directory(folder, filename + ".webp")
+        else:
+            response = send_from_directory(folder, filename)
+        response.vary.add("Accept")
+    else:
+        accepted = request.accept_encodings
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if encoding in accepted and os.path.isfile(
+                os.path.join(folder, filename + suffix)
+            ):
+                response = send_from_directory(folder, filename + suffix)
+                response.mimetype = (
+                    mimetypes.guess_type(filename)[0] or "application/octet-stream"
+                )
+                response.content_encoding = encoding
+                break
+        response = response or send_from_directory(folder, filename)
+        response.vary.add("Accept-Encoding")
+
+    if filename.startswith(BUILD_DIR + "/"):
+        response.headers["Cache-Control"] = IMMUTABLE
+    return response
+
+
+# Function to route url_for('static', ...) through the fingerprinted copies
+def init_assets(app):
+    manifest = load_manifest(app.static_folder)
+
+    @app.url_defaults
+    def fingerprint(endpoint, values):
+        if endpoint == "static" and values.get("filename") in manifest:
+            values["filename"] = manifest[values["filename"]]
+
+    app.view_functions["static"] = serve_static
+
+
+@assets_cli.command("build")
+def build_command():
+    """Fingerprint, gzip/brotli-compress and WebP-convert static/ files."""
+    manifest = build_assets(current_app.static_folder)
+    click.echo(f"built {len(manifest)} assets into static/{BUILD_DIR}/")
+    if brotli is None:
+        click.echo("brotli is not installed: skipped .br variants")
+    if Image is None:
+        click.echo("Pillow is not installed: skipped WebP conversion")
@@ -0,0 +1,88 @@
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, has_request_context, session
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+from models.versions import data_version
+
+
+# Bounded LRU of rendered fragments whose entries also expire after "timeout"
+# seconds, which bounds staleness from writes committed by other processes
+class FragmentCache:
+    def __init__(self, max_entries=256, timeout=60):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.hits = self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# {% cache "table", key, ... %}...{% endcache %}
+#
+# Caches the block's output keyed on the template position, the data version
+# of "table" (bumped after every commit that writes it) and the extra key
+# values. Anything the block reads should be loaded lazily inside it, so a
+# hit skips the query as well as the rendering.
+class FragmentCacheExtension(Extension):
+    tags = {"cache"}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [nodes.Const(f"{parser.name}:{lineno}"), parser.parse_expression()]
+        while parser.stream.skip_if("comma"):
+            args.append(parser.parse_expression())
+        body = parser.parse_statements(["name:endcache"], drop_needle=True)
+        return nodes.CallBlock(
+            self.call_method("_cache", [nodes.List(args)]), [], [], body
+        ).set_lineno(lineno)
+
+    def _cache(self, parts, caller):
+        # Pending flash messages are consumed by rendering, never cached
+        if not has_request_context() or "_flashes" in session:
+            return caller()
+        cache = current_app.extensions["fragment_cache"]
+        position, table, *key = parts
+        cache_key = (position, table, data_version(table), repr(key))
+        rendered = cache.get(cache_key)
+        if rendered is None:
+            rendered = str(caller())
+            cache.set(cache_key, rendered)
+        return Markup(rendered)
+
+
+# Function to enable the {% cache %} tag with a size-capped LRU
+def init_fragment_cache(app):
+    app.extensions["fragment_cache"] = FragmentCache(
+        max_entries=app.config["FRAGMENT_CACHE_SIZE"],
+        timeout=app.config["FRAGMENT_CACHE_TIMEOUT"],
+    )
+    app.jinja_env.add_extension(FragmentCacheExtension)
@@ -0,0 +1,74 @@
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import current_app, make_response, request, session
+
+# (ETag, Last-Modified) of each cached view's rendered body, by view and
+# view arguments
+_rendered = {}
+
+
+# Function to build the Cache-Control value for a policy
+def cache_control(max_age):
+    if max_age:
+        return f"public, max-age={max_age}"
+    return "no-cache"
+
+
+# Function to check the request's validators against the current ones
+def is_fresh(etag, last_modified):
+    if request.if_none_match:
+        return etag in request.if_none_match
+    since = request.if_modified_since
+    return bool(last_modified and since and since >= last_modified)
+
+
+# Decorator declaring a view's HTTP cache policy
+#
+# The strong ETag comes from "version()" when given (e.g. a data version),
+# otherwise from the rendered body, which also gets a Last-Modified of when
+# that body was first seen. A conditional GET that matches is answered with
+# 304 before the view runs. Body ETags are only remembered for views that
+# render the same body for the same arguments, and pages with pending flash
+# messages are always rendered. Use max_age=0 for pages that show flashes so
+# browsers revalidate after a redirect.
+def cache_policy(max_age=0, version=None):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view(*args, **kwargs)
+
+            key = (view.__module__, view.__qualname__, tuple(sorted(kwargs.items())))
+            flashes = "_flashes" in session
+            etag, last_modified = None, None
+            if flashes:
+                pass
+            elif version is not None:
+                etag = hashlib.sha256(f"{key}:{version()}".encode()).hexdigest()
+            elif not current_app.jinja_env.auto_reload:
+                etag, last_modified = _rendered.get(key, (None, None))
+
+            if etag and is_fresh(etag, last_modified):
+                response = current_app.response_class(status=304)
+                response.set_etag(etag)
+                response.last_modified = last_modified
+            else:
+                response = make_response(view(*args, **kwargs))
+                if version is not None and etag:
+                    response.set_etag(etag)
+                else:
+                    response.add_etag()
+                if etag is None and response.status_code == 200 and not flashes:
+                    last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+                    _rendered[key] = (response.get_etag()[0], last_modified)
+                response.last_modified = last_modified
+                response.make_conditional(request)
+
+            response.headers["Cache-Control"] = cache_control(max_age)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,449 @@
+import io
+
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    flash,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    session,
+    stream_with_context,
+    url_for,
+)
+
+from models.counters import read_counters
+from models.funnel import funnel_report
+from models.intake import insert_unique, phone_in
+from models.lead_bulk import delete_many, parse_ids, update_statuses
+from models.lead_export import MIMETYPES as EXPORT_MIMETYPES
+from models.lead_export import export_filters, export_leads
+from models.lead_import import format_for, import_leads, iter_rows
+from models.leads import (
+    SERVICES,
+    STATUSES,
+    grid_filters,
+    lead_error,
+    lead_grid,
+    lead_to_dict,
+)
+from models.model import Employee, Query, User, db
+from models.pagination import LazyPage
+from models.phones import canonical_phone
+from models.replica import reads_from_replica
+from models.rollups import PERIODS, refresh_rollups, rollup_report
+from models.services import service_counts
+
+manager_page = Blueprint("manager", __name__)
+
+
+# Route for manager's dashboard page
+@manager_page.route("/login/manager", methods=["GET", "POST"])
+@reads_from_replica
+def manager_login():
+    if session.get("user_option") == "manager":
+        leads = read_counters("user_queries")["user_queries"]
+        total_users = sum(leads.values())
+        pending_leads = leads.get("pending", 0)
+        call_done_leads = leads.get("call_done", 0)
+        waiting_leads = leads.get("waiting", 0)
+        scheduled_leads = leads.get("scheduled", 0)
+        converted_leads = leads.get("converted", 0)
+        declined_leads = leads.get("declined", 0)
+
+        return render_template(
+            "/manager/manager.html",
+            total_users=total_users,
+            pending_leads=pending_leads,
+            call_done_leads=call_done_leads,
+            waiting_leads=waiting_leads,
+            scheduled_leads=scheduled_leads,
+            converted_leads=converted_leads,
+            declined_leads=declined_leads,
+            service_counts=service_counts(),
+        )
+    return redirect(url_for("public.home"))
+
+
+# Route for manager's add/ update/ delete page
+@manager_page.route("/manager/all_leads")
+def flash_message_manager():
+    if session.get("user_option") == "manager":
+        lead_name = session.get("lead_name")
+        phone_number = session.get("phone_number")
+        return render_template(
+            "/manager/all_leads.html", lead_name=lead_name, phone_number=phone_number
+        )
+    return redirect(url_for("public.home"))
+
+
+# Route for manager's add page
+@manager_page.route("/manager/all_leads/add", methods=["GET", "POST"])
+def add_leads():
+    if session.get("user_option") == "manager":
+        lead_name = session.get("lead_name")
+        phone_number = session.get("phone_number")
+        if request.method == "POST":
+            lead_name = request.form.get("lead_name")
+            services = request.form.getlist("service")
+            service = ", ".join(services)
+            phone_number = request.form.get("phone_number")
+            query = request.form.get("query")
+            if lead_error(lead_name, service, phone_number, query):
+                flash("Enter all details correctly to proceed.")
+                return redirect(
+                    url_for(
+                        "manager.add_leads",
+                        lead_name=lead_name,
+                        phone_number=phone_number,
+                    )
+                )
+            phone_number = canonical_phone(phone_number)
+            try:
+                _, collided = insert_unique(
+                    Query,
+                    {
+                        "lead_name": lead_name,
+                        "service": service,
+                        "phone_number": phone_number,
+                        "phone": phone_number,
+                        "query": query,
+                    },
+                    guards={
+                        "phone_number": phone_in(Query, phone_number)
+                        | phone_in(User, phone_number)
+                        | phone_in(Employee, phone_number)
+                    },
+                )
+                if collided:
+                    flash("Phone number already exists.")
+                    return redirect(
+                        url_for(
+                            "manager.add_leads",
+                            lead_name=lead_name,
+                            phone_number=phone_number,
+                        )
+                    )
+                db.session.commit()
+                flash("Query added successfully.")
+                return redirect(
+                    url_for(
+                        "manager.flash_message_manager",
+                        lead_name=lead_name,
+                        phone_number=phone_number,
+                    )
+                )
+            except:
+                db.session.rollback()
+                flash("Phone number already exists.")
+                return render_template(
+                    "/manager/manager_add.html",
+                    lead_name=lead_name,
+                    phone_number=phone_number,
+                )
+        return render_template(
+            "/manager/manager_add.html", lead_name=lead_name, phone_number=phone_number
+        )
+    return redirect(url_for("public.home"))
+
+
+# Route for manager's bulk lead import
+@manager_page.route("/manager/all_leads/import", methods=["POST"])
+def upload_leads():
+    if session.get("user_option") == "manager":
+        upload = request.files.get("file")
+        if upload is None or not upload.filename:
+            return jsonify({"error": "Upload a CSV or JSONL file."}), 400
+
+        rejects = []
+        max_rejects = current_app.config["IMPORT_MAX_REPORTED_REJECTS"]
+
+        def report(line_num, reason):
+            if len(rejects) < max_rejects:
+                rejects.append({"line": line_num, "reason": reason})
+
+        fmt = request.form.get("format") or format_for(upload.filename)
+        stream = io.TextIOWrapper(upload.stream, encoding="utf-8", newline="")
+        try:
+            stats = import_leads(iter_rows(stream, fmt), on_reject=report)
+        except (ValueError, UnicodeDecodeError) as e:
+            db.session.rollback()
+            return jsonify({"error": str(e)}), 400
+        return jsonify({**stats, "rejects": rejects})
+    return jsonify({"error": "Unauthorized"}), 401
+
+
+# Route for manager's update page
+@manager_page.route("/manager/all_leads/update", methods=["GET", "POST"])
+def update_leads():
+    if session.get("user_option") == "manager":
+        lead_name = session.get("lead_name")
+        phone_number = session.get("phone_number")
+        query = session.get("query")
+        if request.method == "POST":
+            id = request.form.get("id")
+            lead_name = request.form.get("lead_name")
+            services = request.form.getlist("service")
+            service = ", ".join(services)
+            query = request.form.get("query")
+            status = request.form.get("status")
+            if not id:
+                flash("Enter ID to proceed further.", "error")
+                return render_template(
+                    "/manager/manager_update.html",
+                    lead_name=lead_name,
+                    phone_number=phone_number,
+                )
+            if not lead_name and not service and not status and not query:
+                flash("Enter at least one field to proceed further.", "error")
+                return render_template(
+                    "/manager/manager_update.html",
+                    lead_name=lead_name,
+                    phone_number=phone_number,
+                )
+            else:
+                lead = db.session.query(Query).filter_by(id=id).first()
+                if lead:
+                    if lead_name:
+                        lead.lead_name = lead_name
+                    if service:
+                        lead.service = service
+                    if query:
+                        lead.query = query
+                    if status:
+                        lead.status = status
+                    db.session.commit()
+                    flash("Query updated successfully.", "success")
+                    return redirect(url_for("manager.flash_message_manager"))
+                else:
+                    flash("No lead found with the above ID.", "error")
+                    return render_template("/manager/manager_update.html")
+        return render_template(
+            "/manager/manager_update.html",
+            lead_name=lead_name,
+            phone_number=phone_number,
+        )
+    return redirect(url_for("public.home"))
+
+
+# Route for manager's delete
+@manager_page.route("/manager/all_leads/delete", methods=["GET", "POST"])
+def delete_leads():
+    if session.get("user_option") == "manager":
+        id = request.args.get("id")
+        query = db.session.query(Query).filter_by(id=id).first()
+        if query:
+            db.session.delete(query)
+            db.session.commit()
+            flash("Query deleted successfully.", "success")
+        else:
+            flash("Query not found.", "error")
+
+        return render_template(
+            "all_leads.html",
+        )
+    return redirect(url_for("public.home"))
+
+
+# Function to read a bulk request, ids and fields from a JSON body or from the
+# grid's checkboxes, returning (ids, fields, error)
+def bulk_request():
+    if request.is_json:
+        data = request.get_json(silent=True) or {}
+        values = data.get("ids")
+        if not isinstance(values, list):
+            values = None
+    else:
+        data = request.form
+        values = request.form.getlist("ids")
+    ids = parse_ids(values) if values is not None else None
+    if ids is None:
+        return None, data, "Send ids as a list of lead IDs."
+    if not ids:
+        return None, data, "Select at least one lead."
+    if len(ids) > current_app.config["BULK_MAX_IDS"]:
+        return None, data, "Too many leads in one request."
+    return ids, data, None
+
+
+# Function to answer a bulk request, JSON for API callers and a flash plus
+# redirect back to the grid for form posts
+def bulk_response(payload, message, category="success", status=200):
+    if request.is_json:
+        return jsonify(payload), status
+    flash(message, category)
+    return redirect(url_for("manager.view_all_queries"))
+
+
+# Route for manager's bulk status update
+@manager_page.route("/manager/all_leads/bulk_status", methods=["POST"])
+def bulk_update_status():
+    if session.get("user_option") == "manager":
+        ids, data, error = bulk_request()
+        status = data.get("status")
+        if error is None and status not in STATUSES:
+            error = "Choose a valid status."
+        if error:
+            return bulk_response({"error": error}, error, "error", 400)
+        updated = update_statuses(ids, status)
+        return bulk_response(
+            {"requested": len(ids), "updated": updated},
+            f"{updated} of {len(ids)} queries moved to {status}.",
+        )
+    return jsonify({"error": "Unauthorized"}), 401
+
+
+# Route for manager's bulk delete
+@manager_page.route("/manager/all_leads/bulk_delete", methods=["POST"])
+def bulk_delete_leads():
+    if session.get("user_option") == "manager":
+        ids, data, error = bulk_request()
+        if error:
+            return bulk_response({"error": error}, error, "error", 400)
+        deleted = delete_many(ids)
+        return bulk_response(
+            {"requested": len(ids), "deleted": deleted},
+            f"{deleted} of {len(ids)} queries deleted.",
+        )
+    return jsonify({"error": "Unauthorized"}), 401
+
+
+# Route to view all queries
+@manager_page.route("/login/manager/all_queries", methods=["GET", "POST"])
+@reads_from_replica
+def view_all_queries():
+    if session.get("user_option") == "manager":
+        if request.method == "POST":
+            id = request.form.get("id")
+            lead_name = request.form.get("lead_name")
+            services = request.form.getlist("service")
+            service = ", ".join(services)
+            phone_number = request.form.get("phone_number")
+            query = request.form.get("query")
+            status = request.form.get("status")
+
+            if canonical_phone(phone_number) is None:
+                flash("Please enter a valid 10-digit phone number.", "error")
+                return redirect(url_for("manager.view_all_queries"))
+
+            queries = db.session.query(Query).filter_by(id=id).first()
+
+            if queries:
+                queries.lead_name = lead_name
+                queries.service = service
+                queries.phone_number = phone_number
+                queries.query = query
+                queries.status = status
+
+                db.session.commit()
+                flash("Query updated successfully.", "success")
+            else:
+                flash("Query not found.", "error")
+
+            return redirect(url_for("manager.view_all_queries"))
+
+        filters = grid_filters(request.args)
+        # Fetched by the template only when its cached fragment is stale
+        queries = LazyPage(lead_grid, filters, cursor=request.args.get("cursor"))
+        return render_template(
+            "/manager/all_queries.html",
+            queries=queries,
+            filters=filters,
+            statuses=STATUSES,
+            services=SERVICES,
+        )
+    return redirect(url_for("public.home"))
+
+
+# Route to fetch one screen of queries as JSON
+@manager_page.route("/login/manager/all_queries.json", methods=["GET"])
+@reads_from_replica
+def view_all_queries_json():
+    if session.get("user_option") == "manager":
+        filters = grid_filters(request.args)
+        page = lead_grid(filters, cursor=request.args.get("cursor"))
+        return jsonify(
+            {
+                "leads": [lead_to_dict(lead) for lead in page],
+                "filters": filters,
+                "next_cursor": page.next_cursor,
+                "prev_cursor": page.prev_cursor,
+            }
+        )
+    return jsonify({"error": "Unauthorized"}), 401
+
+
+# Route to export all queries
+@manager_page.route("/login/manager/all_queries/export", methods=["GET"])
+def export_all_queries():
+    if session.get("user_option") == "manager":
+        fmt = request.args.get("format", "csv")
+        if fmt not in EXPORT_MIMETYPES:
+            return jsonify({"error": "Use format=csv or format=ndjson."}), 400
+        filters = export_filters(request.args)
+        response = Response(
+            stream_with_context(export_leads(fmt, **filters)),
+            mimetype=EXPORT_MIMETYPES[fmt],
+        )
+        response.headers["Content-Disposition"] = (
+            f"attachment; filename=leads.{fmt}"
+        )
+        return response
+    return redirect(url_for("public.home"))
+
+
+# Route for the conversion funnel and time-in-stage report
+@manager_page.route("/login/manager/funnel", methods=["GET"])
+@reads_from_replica
+def view_funnel():
+    if session.get("user_option") == "manager":
+        return render_template("/manager/funnel.html", report=funnel_report())
+    return redirect(url_for("public.home"))
+
+
+# Route to fetch the funnel report as JSON
+@manager_page.route("/login/manager/funnel.json", methods=["GET"])
+@reads_from_replica
+def view_funnel_json():
+    if session.get("user_option") == "manager":
+        return jsonify(funnel_report())
+    return jsonify({"error": "Unauthorized"}), 401
+
+
+# Function to refresh the rollups and build the weekly or monthly report
+def lead_report(period):
+    refresh_rollups()
+    return {
+        dimension: rollup_report(dimension, period)
+        for dimension in ("created", "status", "service")
+    }
+
+
+# Route for the weekly and monthly lead reports
+@manager_page.route("/login/manager/reports", methods=["GET"])
+def view_reports():
+    if session.get("user_option") == "manager":
+        period = request.args.get("period")
+        period = period if period in PERIODS else "week"
+        return render_template(
+            "/manager/reports.html",
+            period=period,
+            periods=PERIODS,
+            report=lead_report(period),
+            statuses=STATUSES,
+            services=SERVICES,
+        )
+    return redirect(url_for("public.home"))
+
+
+# Route to fetch a weekly or monthly lead report as JSON
+@manager_page.route("/login/manager/reports.json", methods=["GET"])
+def view_reports_json():
+    if session.get("user_option") == "manager":
+        period = request.args.get("period")
+        if period not in PERIODS:
+            return jsonify({"error": "Use period=week or period=month."}), 400
+        return jsonify({"period": period, **lead_report(period)})
+    return jsonify({"error": "Unauthorized"}), 401
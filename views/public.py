@@ -0,0 +1,193 @@
+from flask import Blueprint, flash, redirect, render_template, request, session, url_for
+from markupsafe import Markup
+
+from models.intake import email_in, insert_unique, phone_has_other_lead
+from models.model import Employee, Query, User, db
+from models.passwords import hash_password, verify_and_upgrade
+from models.phones import canonical_phone
+from views.http_cache import cache_policy
+
+public_page = Blueprint("public", __name__)
+
+
+# Function to save user data to database, returning the key that collided
+def save_user(lead_name, email, phone_number, password):
+    phone_number = canonical_phone(phone_number)
+    values = {
+        "lead_name": lead_name,
+        "email": email,
+        "phone_number": phone_number,
+        "phone": phone_number,
+        "password": hash_password(password),
+    }
+    guards = {"lead_name": phone_has_other_lead(phone_number, lead_name)}
+
+    if email.endswith("@admin.com") or email.endswith("@manager.com"):
+        values["option"] = "admin" if email.endswith("@admin.com") else "manager"
+        guards["email"] = email_in(User, email)
+        model = Employee
+    else:
+        guards["email"] = email_in(Employee, email)
+        model = User
+
+    _, collided = insert_unique(model, values, guards)
+    db.session.commit()
+    return collided
+
+
+def check_user(email, password):
+    user = User.query.filter_by(email=email, password=password).first()
+    if user:
+        return user.lead_name, user.option
+    employee = Employee.query.filter_by(email=email, password=password).first()
+    if employee:
+        return employee.lead_name, employee.option
+    return None, None
+
+
+# Route for home page
+@public_page.route("/")
+@cache_policy(max_age=300)
+def home():
+    return render_template("home.html")
+
+
+# Route for signup
+@public_page.route("/signup", methods=["GET", "POST"])
+@cache_policy(max_age=0)
+def create_account():
+    if request.method == "POST":
+        lead_name = request.form["lead_name"]
+        email = request.form["email"]
+        phone_number = request.form["phone_number"]
+        password = request.form["password"]
+
+        if not (8 <= len(password) <= 13):
+            flash("Password must be between 8 to 13 characters!", "error")
+            return redirect(url_for("public.create_account"))
+
+        if canonical_phone(phone_number) is None:
+            flash("Please enter a valid 10-digit phone number!", "error")
+            return redirect(url_for("public.create_account"))
+
+        collided = save_user(lead_name, email, phone_number, password)
+        if collided == "lead_name":
+            flash("Lead name already exists for this phone number!", "error")
+        elif collided:
+            flash("Email or phone number already exists!", "error")
+        else:
+            flash(
+                Markup(
+                    'Account created! <a href="/login" style="color:green">Login</a> now'
+                ),
+                "success",
+            )
+        return redirect(url_for("public.create_account"))
+
+    return render_template("signup.html")
+
+
+# Route for login
+@public_page.route("/login", methods=["GET", "POST"])
+@cache_policy(max_age=0)
+def log_into_account():
+    if request.method == "POST":
+        email, password = request.form["email"], request.form["password"]
+        user = (
+            User.query.filter_by(email=email).first()
+            or Employee.query.filter_by(email=email).first()
+        )
+        if user and verify_and_upgrade(user, password):
+            if user in db.session.dirty:
+                db.session.commit()
+            session.update(
+                {
+                    "lead_name": user.lead_name,
+                    "email": email,
+                    "user_option": user.option,
+                }
+            )
+            if user.option == "user":
+                session["phone_number"] = user.phone_number
+                return redirect(url_for("user.login_user_details"))
+            else:
+                return redirect(
+                    url_for(
+                        "admin.admin_login"
+                        if user.option == "admin"
+                        else "manager.manager_login"
+                    )
+                )
+        else:
+            flash(
+                Markup(
+                    'Email or password incorrect! <a href="/signup" style="color:green"> Signup </a>instead'
+                ),
+                "success",
+            )
+    return render_template("/login/login.html")
+
+
+# Route for contact us
+@public_page.route("/contact_us", methods=["GET", "POST"])
+@cache_policy(max_age=0)
+def contact_form():
+    if request.method == "POST":
+        lead_name = request.form.get("lead_name")
+        services = request.form.getlist("service")
+        service = ", ".join(services)
+        phone_number = request.form.get("phone_number")
+        query = request.form.get("query")
+
+        if not lead_name or not service or not phone_number or not query:
+            flash("Please fill out all fields.", "error")
+        if canonical_phone(phone_number) is None:
+            flash("Please enter the correct phone number.", "error")
+        else:
+            existing_query = (
+                db.session.query(Query)
+                .filter_by(phone=canonical_phone(phone_number))
+                .first()
+            )
+            if existing_query:
+                flash("Phone number already exists.", "error")
+            else:
+                new_query = Query(lead_name, service, phone_number, query)
+                db.session.add(new_query)
+                db.session.commit()
+                flash(
+                    Markup(
+                        "<h1 style= 'color: green'>Query Submitted, we will reach out to you shortly!</h1>"
+                    ),
+                    "success",
+                )
+                return redirect(url_for("public.contact_form"))
+    return render_template("/contact_us/contact_us.html")
+
+
+# Route for forgot password
+@public_page.route("/login/forgot_password", methods=["GET", "POST"])
+def forgot_pwd():
+    if request.method == "POST":
+        email = request.form.get("email")
+        lead_name = request.form.get("lead_name")
+        phone_number = request.form.get("phone_number")
+        if not email or not lead_name or not phone_number:
+            flash("Please fill all the fields.", "error")
+            return render_template("/login/login.html")
+        user = db.session.query(User).filter_by(email=email).first()
+        if user is None:
+            flash("User with this email does not exist.", "error")
+            return render_template("/login/login.html")
+        else:
+            flash(
+                "Password reset instructions have been sent to your email.", "success"
+            )
+            return render_template("/login/login.html")
+
+
+# Route for logout
+@public_page.route("/logout")
+def log():
+    session.clear()
+    return render_template("logout.html")
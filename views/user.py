@@ -0,0 +1,180 @@
+from flask import (
+    Blueprint,
+    flash,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    session,
+    url_for,
+)
+from markupsafe import Markup
+
+from models.leads import lead_to_dict, query_history
+from models.model import Query, User, db
+from models.passwords import hash_password
+from models.phones import canonical_phone
+
+user_page = Blueprint("user", __name__)
+
+
+# Route for login user
+@user_page.route("/login/user", methods=["GET"])
+def login_user_details():
+    if session.get("user_option") == "user":
+        lead_name = session.get("lead_name")
+        phone_number = session.get("phone_number")
+        status = session.get("status")
+        id = session.get("id")
+        user = User.query.filter_by(lead_name=lead_name).first()
+        return render_template(
+            "/login/login_user.html",
+            lead_name=lead_name,
+            status=status,
+            id=id,
+            phone_number=phone_number,
+        )
+    return redirect(url_for("public.home"))
+
+
+# Route for user's tracking details (after logging-in)
+@user_page.route("/your_details", methods=["GET", "POST"])
+def user_details():
+    if session.get("user_option") == "user":
+        cursor = request.args.get("cursor")
+        user, queries = query_history(session["email"], cursor)
+        if user is None:
+            return redirect(url_for("public.home"))
+
+        if not queries and not cursor:
+            flash(
+                "Please fill the 'Contact Us' first to track your query!",
+                "error",
+            )
+            return render_template(
+                "/login/login_user.html",
+                lead_name=user.lead_name,
+                phone_number=user.phone_number,
+            )
+        return render_template(
+            "/login/your_details.html",
+            lead_name=user.lead_name,
+            queries=queries,
+        )
+    return redirect(url_for("public.home"))
+
+
+# Route to fetch one page of the user's query history as JSON
+@user_page.route("/your_details.json", methods=["GET"])
+def user_details_json():
+    if session.get("user_option") == "user":
+        user, queries = query_history(session["email"], request.args.get("cursor"))
+        if user is None:
+            return jsonify({"error": "Unauthorized"}), 401
+        return jsonify(
+            {
+                "lead_name": user.lead_name,
+                "queries": [lead_to_dict(query) for query in queries],
+                "next_cursor": queries.next_cursor,
+                "prev_cursor": queries.prev_cursor,
+            }
+        )
+    return jsonify({"error": "Unauthorized"}), 401
+
+
+# Route for contact us after logging in
+@user_page.route("/login/user/contact_us", methods=["GET", "POST"])
+def contact_us_form_after_login():
+    lead_name = session.get("lead_name")
+    phone_number = session.get("phone_number")
+
+    if not lead_name or not phone_number:
+        return redirect(url_for("public.home"))
+
+    if request.method == "GET":
+        return render_template(
+            "/contact_us/contact_us_for_signed.html",
+            lead_name=lead_name,
+            phone_number=phone_number,
+        )
+
+    if request.method == "POST":
+        if session.get("user_option") == "user":
+            services = request.form.getlist("service")
+            service = ", ".join(services)
+            query = request.form.get("query")
+            status = request.form.get("status")
+            if not service or not query:
+                flash("Please fill out all fields.", "error")
+            elif canonical_phone(phone_number) is None:
+                # Accounts made before phones were validated may hold any text
+                flash(
+                    "Your phone number isn't a valid 10-digit number, please "
+                    "contact us to update it.",
+                    "error",
+                )
+                return redirect(url_for("user.login_user_details"))
+            else:
+                contact = Query(
+                    lead_name=lead_name,
+                    service=service,
+                    phone_number=phone_number,
+                    query=query,
+                )
+                db.session.add(contact)
+                db.session.commit()
+                flash(
+                    Markup(
+                        "<h1 style='color: green'>Query Submitted, we will reach out to you shortly!</h1>"
+                    ),
+                    "success",
+                )
+                return redirect(url_for("user.login_user_details"))
+
+    return render_template("/login/login_user.html")
+
+
+# Route to reset password
+@user_page.route("/login/user/reset_pwd", methods=["GET", "POST"])
+def reset_pwd():
+    if session.get("user_option") == "user":
+        lead_name = session.get("lead_name")
+        phone_number = session.get("phone_number")
+        email = session.get("email")
+        if request.method == "POST":
+            password = request.form.get("password")
+            confirm_password = request.form.get("confirm_password")
+            user = db.session.query(User).filter_by(email=email).first()
+            if not password or not confirm_password:
+                flash("Please fill all the fields.", "error")
+                return render_template(
+                    "/login/login_user.html",
+                    lead_name=lead_name,
+                    phone_number=phone_number,
+                )
+            if password != confirm_password:
+                flash("Passwords do not match.", "error")
+                return render_template(
+                    "/login/login_user.html",
+                    lead_name=lead_name,
+                    phone_number=phone_number,
+                )
+            else:
+                if len(password) >= 8 and len(password) < 13:
+                    user.password = hash_password(confirm_password)
+                    db.session.commit()
+                    flash("Password reset successfully.", "success")
+                    return render_template(
+                        "login/login_user.html",
+                        lead_name=lead_name,
+                        phone_number=phone_number,
+                    )
+                else:
+                    flash("Password must be atleast 8 characters long.", "error")
+                    return render_template(
+                        "/login/login_user.html",
+                        lead_name=lead_name,
+                        phone_number=phone_number,
+                    )
+
+    return redirect(url_for("public.home"))